@@ -0,0 +1,32 @@
+"""adding track poll order index
+
+Revision ID: 5e0c7a91d4f2
+Revises: b3d81f6c2a47
+Create Date: 2026-10-18 13:40:09.502317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c7a91d4f2'
+down_revision: Union[str, None] = 'b3d81f6c2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tracks_poll_order',
+        'tracks',
+        ['social_media', 'profile_username', 'id'],
+        unique=False,
+        postgresql_where=sa.text('alert_enabled'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tracks_poll_order', table_name='tracks')
@@ -0,0 +1,100 @@
+"""partitioning follower_history by month
+
+Revision ID: 8c4f2e6a1b93
+Revises: 5e0c7a91d4f2
+Create Date: 2026-10-18 15:02:27.731940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2e6a1b93'
+down_revision: Union[str, None] = '5e0c7a91d4f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months of partitions created ahead of the current month; the app keeps extending them.
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE follower_history RENAME TO follower_history_old")
+    op.execute("ALTER TABLE follower_history_old RENAME CONSTRAINT follower_history_pkey TO follower_history_old_pkey")
+    op.execute("ALTER TABLE follower_history_old RENAME CONSTRAINT follower_history_track_id_fkey TO follower_history_old_track_id_fkey")
+    op.execute("ALTER INDEX ix_follower_history_id RENAME TO ix_follower_history_old_id")
+
+    op.execute(
+        """
+        CREATE TABLE follower_history (
+            id UUID NOT NULL,
+            track_id UUID,
+            follower_count INTEGER,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            deleted_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT follower_history_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT follower_history_track_id_fkey FOREIGN KEY (track_id) REFERENCES tracks (id)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_index(op.f('ix_follower_history_id'), 'follower_history', ['id'], unique=False)
+    op.create_index('ix_follower_history_track_id_created_at', 'follower_history', ['track_id', 'created_at'], unique=False)
+    op.execute("CREATE TABLE follower_history_default PARTITION OF follower_history DEFAULT")
+
+    # One partition per month from the oldest existing row up to MONTHS_AHEAD months from now.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month_start DATE := date_trunc('month', COALESCE((SELECT min(created_at) FROM follower_history_old), now()));
+            last_month DATE := date_trunc('month', now()) + interval '{MONTHS_AHEAD} months';
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF follower_history FOR VALUES FROM (%L) TO (%L)',
+                    'follower_history_p' || to_char(month_start, 'YYYYMM'),
+                    month_start,
+                    month_start + interval '1 month'
+                );
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END $$;
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO follower_history (id, track_id, follower_count, created_at, updated_at, deleted_at)
+        SELECT id, track_id, follower_count, created_at, updated_at, deleted_at FROM follower_history_old
+        """
+    )
+    op.drop_table('follower_history_old')
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE follower_history RENAME TO follower_history_partitioned")
+    op.create_table('follower_history',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('track_id', sa.UUID(), nullable=True),
+    sa.Column('follower_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['track_id'], ['tracks.id'], name='follower_history_old_track_id_fkey'),
+    sa.PrimaryKeyConstraint('id', name='follower_history_old_pkey')
+    )
+    op.execute(
+        """
+        INSERT INTO follower_history (id, track_id, follower_count, created_at, updated_at, deleted_at)
+        SELECT id, track_id, follower_count, created_at, updated_at, deleted_at FROM follower_history_partitioned
+        """
+    )
+    # Dropping the partitioned parent drops its partitions and indexes too.
+    op.drop_table('follower_history_partitioned')
+    op.execute("ALTER TABLE follower_history RENAME CONSTRAINT follower_history_old_pkey TO follower_history_pkey")
+    op.execute("ALTER TABLE follower_history RENAME CONSTRAINT follower_history_old_track_id_fkey TO follower_history_track_id_fkey")
+    op.create_index(op.f('ix_follower_history_id'), 'follower_history', ['id'], unique=False)
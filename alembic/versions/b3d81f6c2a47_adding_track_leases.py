@@ -0,0 +1,30 @@
+"""adding track leases
+
+Revision ID: b3d81f6c2a47
+Revises: 9591b1b407a4
+Create Date: 2026-10-18 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d81f6c2a47'
+down_revision: Union[str, None] = '9591b1b407a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tracks', sa.Column('lease_owner', sa.String(), nullable=True))
+    op.add_column('tracks', sa.Column('leased_until', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_tracks_leased_until'), 'tracks', ['leased_until'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tracks_leased_until'), table_name='tracks')
+    op.drop_column('tracks', 'leased_until')
+    op.drop_column('tracks', 'lease_owner')
@@ -0,0 +1,50 @@
+"""adding follower history rollups
+
+Revision ID: d41a7b9c3e58
+Revises: 8c4f2e6a1b93
+Create Date: 2026-10-18 16:21:44.180237
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7b9c3e58'
+down_revision: Union[str, None] = '8c4f2e6a1b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def create_rollup_table(name: str) -> None:
+    op.create_table(name,
+    sa.Column('track_id', sa.UUID(), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('first_count', sa.Integer(), nullable=False),
+    sa.Column('last_count', sa.Integer(), nullable=False),
+    sa.Column('min_count', sa.Integer(), nullable=False),
+    sa.Column('max_count', sa.Integer(), nullable=False),
+    sa.Column('sample_count', sa.Integer(), nullable=False),
+    sa.Column('first_at', sa.DateTime(), nullable=False),
+    sa.Column('last_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['track_id'], ['tracks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('track_id', 'bucket')
+    )
+    op.create_index(f'ix_{name}_bucket', name, ['bucket'], unique=False)
+
+
+def upgrade() -> None:
+    create_rollup_table('follower_history_hourly')
+    create_rollup_table('follower_history_daily')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_follower_history_daily_bucket', table_name='follower_history_daily')
+    op.drop_table('follower_history_daily')
+    op.drop_index('ix_follower_history_hourly_bucket', table_name='follower_history_hourly')
+    op.drop_table('follower_history_hourly')
@@ -1,5 +1,5 @@
 
-from app.api.api_v1.endpoints import (auth, users,stats,track)
+from app.api.api_v1.endpoints import (auth, users,stats,track,history)
 
 from fastapi import APIRouter
 
@@ -14,4 +14,4 @@ api_router.include_router(track.router, prefix="/tracks", tags=["tracks"])
 
 api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
 
-
+api_router.include_router(history.router, prefix="/history", tags=["history"])
\ No newline at end of file
@@ -0,0 +1,59 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import UUID4
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models
+from app.api.deps import get_db, get_current_active_user
+from app.services.analytics import naive_utc
+from app.services.export import MEDIA_TYPES, ExportFormat, ExportResolution, export_history
+
+router = APIRouter()
+
+
+class ExportScope(str, Enum):
+    MINE = "mine"
+    ALL = "all"
+
+
+@router.get("/export/")
+async def export_follower_history(
+    track_id: Optional[UUID4] = None,
+    scope: ExportScope = ExportScope.MINE,
+    format: ExportFormat = ExportFormat.CSV,
+    resolution: ExportResolution = ExportResolution.RAW,
+    gzip: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Stream follower history of one track, of the current user's tracks or of all tracks
+    as CSV or NDJSON, optionally gzip compressed.
+    """
+    since, until = naive_utc(since), naive_utc(until)
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="since must be before until")
+    filters = dict(since=since, until=until)
+    if track_id is not None:
+        if not await crud.track.get_by_track_id(db=db, track_id=track_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="track not found")
+        filters["track_id"] = track_id
+        name = f"follower_history_{track_id}"
+    elif scope == ExportScope.MINE:
+        filters["user_id"] = current_user.id
+        name = f"follower_history_{current_user.username}"
+    else:
+        name = "follower_history"
+
+    filename = f"{name}_{resolution.value}.{format.value}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_history(resolution, format, compress=gzip, **filters),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,6 +1,15 @@
-from fastapi import APIRouter,Depends,HTTPException,status
-from app import models
-from app.services.check_follower import FollowerChecker
+from fastapi import APIRouter,Depends,HTTPException,Query,status
+from datetime import datetime, timedelta
+from typing import Optional
+from app import crud, models, schemas
+from app.constants.enums import SocialMediaPlatform
+from app.core.password_hasher import password_hasher
+from app.core.redis_client import redis_client
+from app.core.token_cache import token_cache
+from app.services import analytics
+from app.services.check_follower import FollowerChecker, poller_stats
+from app.services.engagement_store import engagement_store
+from app.services.rate_limiter import rate_limiter
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_db,get_current_active_user
 
@@ -12,9 +21,10 @@ async def get_top_follower_changes(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
     hours: int = 24,
-    top_n: int = 5):
+    top_n: int = 5,
+    social_media: Optional[SocialMediaPlatform] = None):
     analysis = FollowerChecker()
-    changes = await analysis.get_top_changes(hours=hours, top_n=top_n)
+    changes = await analysis.get_top_changes(hours=hours, top_n=top_n, social_media=social_media)
     return {"top_changes": changes}
 
 
@@ -23,11 +33,126 @@ async def get_engagement(
     profile_username: str,
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
+    hours: int = Query(24, gt=0, le=schemas.MAX_ENGAGEMENT_WINDOW_HOURS),
     ):
     checker = FollowerChecker()
-    engagement_rate = await checker.get_engagement(profile_username)
+    engagement_rate = await checker.get_engagement(profile_username, hours=hours)
 
     if engagement_rate is None:
         raise HTTPException(status_code=404, detail="Profile not found")
 
     return {"profile_username": profile_username, "engagement_rate": engagement_rate}
+
+
+@router.post("/engagement/", response_model=schemas.EngagementPage)
+async def get_engagements(
+    engagement_in: schemas.EngagementRequest,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: models.User = Depends(get_current_active_user),
+    ):
+    """
+    Engagement rates of the current user's tracks for several windows at once,
+    narrowed to profile_usernames when given.
+    """
+    windows = sorted(set(engagement_in.windows))
+    checker = FollowerChecker()
+    items = await checker.get_engagements(
+        windows,
+        user_id=current_user.id,
+        profile_usernames=engagement_in.profile_usernames,
+        skip=skip,
+        limit=limit,
+    )
+    return {"items": items, "skip": skip, "limit": limit}
+
+
+# Upper bound on the points of a resampled analytics series.
+MAX_SERIES_POINTS = 2000
+# Longest analytics window and forecast in hours (ten years and one year).
+MAX_ANALYTICS_HOURS = 24 * 366 * 10
+MAX_FORECAST_HOURS = 24 * 366
+
+
+@router.get("/analytics/")
+async def get_growth(
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+    hours: int = Query(24 * 7, gt=0, le=MAX_ANALYTICS_HOURS),
+    ):
+    """
+    Growth rate and fitted growth per day of every track of the current user.
+    """
+    tracks = await crud.track.get_by_user_id(db=db, user_id=current_user.id)
+    series = await analytics.load_series(
+        db, [track.id for track in tracks], since=datetime.utcnow() - timedelta(hours=hours)
+    )
+    rates = analytics.growth_rates(series)
+    per_day = analytics.growth_per_day(series)
+    growth = [
+        {"track_id": track_id, "growth_rate": round(float(rate), 2), "growth_per_day": round(float(slope), 2)}
+        for track_id, rate, slope in zip(series.track_ids, rates, per_day)
+    ]
+    growth.sort(key=lambda item: item["growth_rate"], reverse=True)
+    return {"hours": hours, "growth": growth}
+
+
+@router.get("/analytics/{track_id}")
+async def get_track_analytics(
+    track_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+    hours: int = Query(24 * 7, gt=0, le=MAX_ANALYTICS_HOURS),
+    step_minutes: int = Query(60, gt=0),
+    ma_window: int = Query(24, gt=0, le=MAX_SERIES_POINTS),
+    z_window: int = Query(24, gt=0, le=MAX_SERIES_POINTS),
+    z_threshold: float = Query(3.0, gt=0),
+    forecast_hours: int = Query(24, gt=0, le=MAX_FORECAST_HOURS),
+    ):
+    """
+    Resampled series with moving average and acceleration, z-score anomalies of the
+    changes and a linear forecast for one track.
+    """
+    track = await crud.track.get_by_track_id(db=db, track_id=track_id)
+    if not track:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="track not found")
+
+    series = await analytics.load_series(db, [track.id], since=datetime.utcnow() - timedelta(hours=hours))
+    timestamps, counts = series.track(0) if series.track_ids else (series.timestamps, series.counts)
+    # Coarse enough that neither the series nor the forecast exceeds MAX_SERIES_POINTS.
+    step = max(step_minutes * 60, max(hours, forecast_hours) * 3600 / MAX_SERIES_POINTS)
+    result = analytics.analyze_track(
+        timestamps,
+        counts,
+        step=step,
+        ma_window=ma_window,
+        z_window=z_window,
+        z_threshold=z_threshold,
+        forecast_horizon=forecast_hours * 3600,
+    )
+    return {"track_id": track.id, "hours": hours, "step_seconds": step, **result}
+
+
+@router.get("/poller/")
+async def get_poller_stats(
+    current_user: models.User = Depends(get_current_active_user),
+    ):
+    return {
+        "poller": poller_stats.to_dict(),
+        "rate_limits": rate_limiter.to_dict(),
+        "engagement_store": engagement_store.to_dict(),
+    }
+
+
+@router.get("/auth-cache/")
+async def get_auth_cache_stats(
+    current_user: models.User = Depends(get_current_active_user),
+    ):
+    return {"token_cache": token_cache.to_dict(), "password_hasher": password_hasher.to_dict()}
+
+
+@router.get("/redis/")
+async def get_redis_stats(
+    current_user: models.User = Depends(get_current_active_user),
+    ):
+    return {"redis_pool": redis_client.to_dict()}
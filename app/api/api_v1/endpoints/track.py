@@ -1,4 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException,status
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Optional
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.api.deps import get_db,get_current_active_user
@@ -7,6 +11,7 @@ from app.models.track import Track
 from app.crud.crud_track import track
 from app import models, schemas, crud
 from app.schemas.search import FilterRuleType, Search, SearchResponse
+from app.services import analytics
 from typing import Any
 from fastapi.encoders import jsonable_encoder
 import logging
@@ -31,6 +36,69 @@ async def get_track_by_id(
 
     return db_track
 
+class SeriesResolution(str, Enum):
+    AUTO = "auto"
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+# Bucket limit of a series: resolution=auto picks a unit within it, explicit resolutions must fit it.
+MAX_SERIES_BUCKETS = 2000
+
+
+@router.get("/{track_id}/series")
+async def get_track_series(
+    track_id: str,
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    resolution: SeriesResolution = SeriesResolution.AUTO,
+    max_points: Optional[int] = Query(None, ge=3),
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Follower counts of a track aggregated into time buckets for charting, optionally
+    reduced to max_points with Largest-Triangle-Three-Buckets downsampling.
+    """
+    db_track = await track.get_by_track_id(db=db, track_id=track_id)
+    if not db_track:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="track not found")
+
+    until = analytics.naive_utc(to) or datetime.utcnow()
+    since = analytics.naive_utc(from_) or until - timedelta(days=7)
+    if since >= until:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="from must be before to")
+    unit = resolution.value
+    if resolution == SeriesResolution.AUTO:
+        unit = analytics.series_unit(since, until, MAX_SERIES_BUCKETS)
+    if (until - since).total_seconds() / analytics.SERIES_UNITS[unit][0] > MAX_SERIES_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{unit} resolution gives more than {MAX_SERIES_BUCKETS} buckets for this range, "
+                   f"use a coarser resolution or a shorter range",
+        )
+
+    rows = await analytics.load_bucketed_series(db, db_track.id, since, until, unit)
+    if max_points and len(rows) > max_points:
+        x = np.array([bucket.replace(tzinfo=timezone.utc).timestamp() for bucket, *_ in rows])
+        y = np.array([count for _, count, *_ in rows], dtype=np.float64)
+        rows = [rows[i] for i in analytics.lttb(x, y, max_points)]
+
+    return {
+        "track_id": db_track.id,
+        "from": since,
+        "to": until,
+        "resolution": unit,
+        "points": [
+            {"timestamp": bucket, "count": count, "min": min_count, "max": max_count}
+            for bucket, count, min_count, max_count in rows
+        ],
+    }
+
+
 @router.get("/", response_model=list[schemas.TrackResponse])
 async def read_tracks(
         db: AsyncSession = Depends(get_db),
@@ -1,6 +1,5 @@
 import logging
 from typing import Any, Dict, List
-import redis
 from app import crud, models, schemas
 from app.api import deps
 from app.schemas.search import FilterRuleType, Search, SearchResponse
@@ -9,8 +8,6 @@ from fastapi.encoders import jsonable_encoder
 from pydantic.networks import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
-r = redis.Redis(host="redis")
-
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 router = APIRouter()
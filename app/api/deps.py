@@ -1,9 +1,11 @@
 import logging
 from typing import Any
-import redis
 from app import crud, models, schemas
 from app.core import security
 from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.core.token_cache import token_cache
+from app.db.query_counter import count_queries
 from app.db.session import SessionLocal
 from fastapi import Body, Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
@@ -11,21 +13,26 @@ from jose import jwt
 from collections.abc import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached, sessionmaker
 
 from app.models.user_session import UserSession
 import json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from redis.asyncio import Redis
-
-from contextlib import asynccontextmanager
+from redis.exceptions import RedisError
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, future=True, connect_args=settings.connect_args)
+count_queries(engine)
 async_session_maker = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# User columns kept in the token cache: what the auth dependencies, the user schemas and the
+# soft delete hook read off the current user. The password hash never sits in the cache.
+CACHED_USER_COLUMNS = ("id", "username", "email", "is_active", "chat_id", "created_at", "updated_at", "deleted_at")
+
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/access_token/"
 )
@@ -41,76 +48,82 @@ async def  get_db() -> AsyncGenerator[Any, Any, Any]:
 
 
 
-@asynccontextmanager
 async def get_redis_conn() -> Redis:
     """
-    Provides an async Redis connection using aioredis.
+    The application wide async Redis client; connections come from its shared pool.
     """
-    redis_conn = await Redis.from_url(f"redis://{settings.REDIS_SERVER}")
-    try:
-        yield redis_conn
-    finally:
-        await redis_conn.close()
+    return redis_client.client
 
 
 
-def verify_token(token: str):
+async def verify_token(db: AsyncSession, token: str) -> dict:
+    """
+    Check the session behind `token`: the user data cached in Redis at login, or the
+    session row when Redis has none. Nothing here blocks the event loop.
+    """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
         session_data = payload['session']
         try:
-            redis_conn = redis.StrictRedis(host=settings.REDIS_HOST)
-            user_data = redis_conn.get(session_data)
+            user_data = await redis_client.client.get(session_data)
             if user_data is not None:
                 return dict(verified=True, user_data=json.loads(user_data))
-        finally:
-            redis_conn.close()
+        except RedisError:
+            logger.warning("Session lookup in Redis failed, falling back to the database", exc_info=True)
 
-        db = SessionLocal()
-        user_session = db.query(UserSession) \
-            .filter(UserSession.session_data == session_data).scalar()
+        result = await db.execute(select(UserSession).where(UserSession.session_data == session_data))
+        user_session = result.scalars().first()
         if not user_session:
             raise Exception('session not found')
         if user_session.is_revoked:
             raise Exception('session revoked')
-        return dict(verified=True, user_data=crud.user.get_user_data(db=db, user_id=user_session.user_id))
+        return dict(verified=True, user_data=await crud.user.get_user_data(db=db, user_id=user_session.user_id))
 
     except (jwt.JWTError, Exception) as e:
-        print(e)
+        logger.info(f"Token verification failed: {e}")
         return dict(verified=False, user_data=None)
 
 
-async def get_current_user_token(
-        db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
-    token_verify = verify_token(token)
+async def authenticate(db: AsyncSession, token: str) -> models.User:
+    """
+    The user behind `token`. A session seen recently in this process is served from the
+    token cache without touching Redis or PostgreSQL.
+    """
+    try:
+        session_data = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])['session']
+    except (jwt.JWTError, KeyError):
+        session_data = None
+    user_columns = token_cache.get(session_data) if session_data else None
+    if user_columns is not None:
+        user = models.User(**user_columns)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    token_verify = await verify_token(db, token)
     if not token_verify["verified"]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
 
-    user = await  crud.user.get(db, id=token_verify["user_data"]["id"])
+    user = await crud.user.get(db, id=token_verify["user_data"]["id"])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return token
+    token_cache.set(session_data, {key: getattr(user, key) for key in CACHED_USER_COLUMNS})
+    return user
 
 
+async def get_current_user_token(
+        db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> str:
+    await authenticate(db, token)
+    return token
+
 
 async def get_current_user(
         db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
 ) -> models.User:
-    token_verify = verify_token(token)
-    if not token_verify["verified"]:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-        )
-
-    user = await crud.user.get(db, id=token_verify["user_data"]["id"])
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return await authenticate(db, token)
 
 
 async def get_current_active_user(
@@ -48,7 +48,99 @@ class Settings(BaseSettings):
     TELEGRAM_API_URL:str = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
     DEFAULT_CHAT_ID : str = "YOUR_CHAT_ID"
 
+    # Serve follower counts from app/services/mock_data.py instead of calling the platforms.
+    USE_MOCK_DATA: bool = os.getenv("USE_MOCK_DATA", "true").lower() in ("1", "true", "yes")
+    INSTAGRAM_API_URL: str = os.getenv("INSTAGRAM_API_URL", "https://api.instagram.com")
+    TWITTER_API_URL: str = os.getenv("TWITTER_API_URL", "https://api.twitter.com")
+
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", 100))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 20))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", 300))
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+    HTTP_TOTAL_TIMEOUT: float = float(os.getenv("HTTP_TOTAL_TIMEOUT", 15))
+
+    # Shared async Redis pool; idle connections are PINGed after REDIS_HEALTH_CHECK_INTERVAL seconds.
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    REDIS_POOL_TIMEOUT: float = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+    REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+
     FOLLOWER_CHECKER_INTERVAL: int = int(os.getenv("FOLLOWER_CHECKER_INTERVAL", 60))
+    FOLLOWER_CHECKER_CONCURRENCY: int = int(os.getenv("FOLLOWER_CHECKER_CONCURRENCY", 50))
+    FOLLOWER_CHECKER_PLATFORM_CONCURRENCY: dict = {
+        "Instagram": int(os.getenv("INSTAGRAM_FETCH_CONCURRENCY", 10)),
+        "Twitter": int(os.getenv("TWITTER_FETCH_CONCURRENCY", 10)),
+    }
+    # Adaptive per-track polling intervals, in seconds. New tracks start at FOLLOWER_CHECKER_INTERVAL.
+    POLL_MIN_INTERVAL: float = float(os.getenv("POLL_MIN_INTERVAL", 15))
+    POLL_MAX_INTERVAL: float = float(os.getenv("POLL_MAX_INTERVAL", 900))
+    POLL_TARGET_CHANGE: float = float(os.getenv("POLL_TARGET_CHANGE", 10))
+    POLL_VOLATILITY_SMOOTHING: float = float(os.getenv("POLL_VOLATILITY_SMOOTHING", 0.3))
+    POLL_CHUNK_SIZE: int = int(os.getenv("POLL_CHUNK_SIZE", 1000))
+    POLL_DISPATCH_LIMIT: int = int(os.getenv("POLL_DISPATCH_LIMIT", 1000))
+    POLL_TRACK_REFRESH_INTERVAL: float = float(os.getenv("POLL_TRACK_REFRESH_INTERVAL", 60))
+    # "local": every process polls every track, "leased": processes claim batches of tracks
+    # through expiring leases, "disabled": this process does not poll (e.g. API-only nodes).
+    FOLLOWER_CHECKER_MODE: str = os.getenv("FOLLOWER_CHECKER_MODE", "local")
+    TRACK_LEASE_BATCH_SIZE: int = int(os.getenv("TRACK_LEASE_BATCH_SIZE", 200))
+    TRACK_LEASE_SECONDS: int = int(os.getenv("TRACK_LEASE_SECONDS", 120))
+    TRACK_LEASE_IDLE_SLEEP: float = float(os.getenv("TRACK_LEASE_IDLE_SLEEP", 5))
+    # Requests per second and burst size per platform credential.
+    PLATFORM_RATE_LIMITS: dict = {
+        "Instagram": {
+            "rate": float(os.getenv("INSTAGRAM_RATE_LIMIT", 1)),
+            "burst": int(os.getenv("INSTAGRAM_RATE_BURST", 10)),
+        },
+        "Twitter": {
+            "rate": float(os.getenv("TWITTER_RATE_LIMIT", 1)),
+            "burst": int(os.getenv("TWITTER_RATE_BURST", 10)),
+        },
+    }
+    # Most usernames one lookup request may carry; 1 means the platform has no batch lookup.
+    PLATFORM_BATCH_SIZES: dict = {
+        "Instagram": int(os.getenv("INSTAGRAM_BATCH_SIZE", 1)),
+        "Twitter": int(os.getenv("TWITTER_BATCH_SIZE", 100)),
+    }
+    RATE_LIMIT_MAX_RETRIES: int = int(os.getenv("RATE_LIMIT_MAX_RETRIES", 3))
+    RATE_LIMIT_BACKOFF_BASE: float = float(os.getenv("RATE_LIMIT_BACKOFF_BASE", 1))
+    RATE_LIMIT_BACKOFF_MAX: float = float(os.getenv("RATE_LIMIT_BACKOFF_MAX", 60))
+    # Monthly follower_history partitions: created this many months ahead, detached after the
+    # retention period (0 keeps them forever) and dropped as well when DROP is set.
+    FOLLOWER_HISTORY_PARTITIONS_AHEAD: int = int(os.getenv("FOLLOWER_HISTORY_PARTITIONS_AHEAD", 3))
+    FOLLOWER_HISTORY_RETENTION_MONTHS: int = int(os.getenv("FOLLOWER_HISTORY_RETENTION_MONTHS", 12))
+    FOLLOWER_HISTORY_DROP_EXPIRED_PARTITIONS: bool = (
+        os.getenv("FOLLOWER_HISTORY_DROP_EXPIRED_PARTITIONS", "false").lower() in ("1", "true", "yes")
+    )
+    PARTITION_MAINTENANCE_INTERVAL: int = int(os.getenv("PARTITION_MAINTENANCE_INTERVAL", 60 * 60 * 24))
+    # Stats read the coarsest hourly/daily rollup that still has this many buckets in the window.
+    ROLLUP_MIN_BUCKETS: int = int(os.getenv("ROLLUP_MIN_BUCKETS", 24))
+    # In-memory 1h/24h/7d engagement store: slots per window, track limit and idle eviction.
+    ENGAGEMENT_STORE_ENABLED: bool = os.getenv("ENGAGEMENT_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+    ENGAGEMENT_STORE_SLOTS: int = int(os.getenv("ENGAGEMENT_STORE_SLOTS", 60))
+    ENGAGEMENT_STORE_MAX_TRACKS: int = int(os.getenv("ENGAGEMENT_STORE_MAX_TRACKS", 20000))
+    ENGAGEMENT_STORE_IDLE_SECONDS: int = int(os.getenv("ENGAGEMENT_STORE_IDLE_SECONDS", 60 * 60 * 24))
+    # Redis leaderboard of follower changes for the 1h/24h/7d windows, with this many slices per window.
+    LEADERBOARD_ENABLED: bool = os.getenv("LEADERBOARD_ENABLED", "true").lower() in ("1", "true", "yes")
+    LEADERBOARD_SLICES: int = int(os.getenv("LEADERBOARD_SLICES", 60))
+    # Retention of raw samples, hourly and daily rollups in days (0 keeps them); raw rows are
+    # rolled up before they are deleted, in batches of RETENTION_BATCH_SIZE rows.
+    FOLLOWER_HISTORY_RAW_RETENTION_DAYS: int = int(os.getenv("FOLLOWER_HISTORY_RAW_RETENTION_DAYS", 7))
+    FOLLOWER_HISTORY_HOURLY_RETENTION_DAYS: int = int(os.getenv("FOLLOWER_HISTORY_HOURLY_RETENTION_DAYS", 90))
+    FOLLOWER_HISTORY_DAILY_RETENTION_DAYS: int = int(os.getenv("FOLLOWER_HISTORY_DAILY_RETENTION_DAYS", 0))
+    RETENTION_BATCH_SIZE: int = int(os.getenv("RETENTION_BATCH_SIZE", 5000))
+    RETENTION_BATCH_PAUSE: float = float(os.getenv("RETENTION_BATCH_PAUSE", 0.1))
+    RETENTION_INTERVAL: int = int(os.getenv("RETENTION_INTERVAL", 60 * 60))
+    # Rows fetched per server-side cursor round trip by the history export.
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 5000))
+    # bcrypt runs in this many threads; up to PASSWORD_HASH_QUEUE_SIZE more calls wait, the rest get 503.
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 64))
+    # Verified sessions cached per process; invalidation is local, so the TTL bounds staleness elsewhere.
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    TOKEN_CACHE_TTL: float = float(os.getenv("TOKEN_CACHE_TTL", 30))
+    FOLLOWER_HISTORY_BATCH_SIZE: int = int(os.getenv("FOLLOWER_HISTORY_BATCH_SIZE", 500))
+    FOLLOWER_HISTORY_FLUSH_INTERVAL: float = float(os.getenv("FOLLOWER_HISTORY_FLUSH_INTERVAL", 5))
 
     model_config = SettingsConfigDict(case_sensitive=True)
 
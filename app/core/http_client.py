@@ -0,0 +1,49 @@
+import logging
+import aiohttp
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient:
+    """
+    Application wide aiohttp session with a keep-alive connection pool.
+
+    Platform fetches and Telegram sends share it instead of opening a new
+    session (and a new pool, DNS lookup and TLS handshake) per request.
+    """
+
+    def __init__(self):
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Started lazily as well, for code paths that run outside the FastAPI lifespan.
+        if self._session is None or self._session.closed:
+            self.start()
+        return self._session
+
+    def start(self) -> None:
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.HTTP_TOTAL_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        logger.info("HTTP client pool started")
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP client pool closed")
+        self._session = None
+
+
+http_client = HTTPClient()
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification in a bounded thread pool instead of on the event loop.
+
+    bcrypt releases the GIL while it works, so other requests keep being served during a login.
+    At most PASSWORD_HASH_WORKERS hashes run at once and PASSWORD_HASH_QUEUE_SIZE more may wait;
+    beyond that calls are rejected with 503 rather than piling up behind each other.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Started lazily as well, for code paths that run outside the FastAPI lifespan.
+        if self._executor is None:
+            self.start()
+        return self._executor
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+        logger.info("Password hashing pool started")
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Password hashing pool closed")
+        self._executor = None
+
+    async def run(self, function, *args):
+        if self.pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many logins in progress, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def to_dict(self) -> dict:
+        return dict(
+            workers=settings.PASSWORD_HASH_WORKERS,
+            queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+            pending=self.pending,
+            completed=self.completed,
+            rejected=self.rejected,
+        )
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,63 @@
+import logging
+from redis.asyncio import BlockingConnectionPool, Redis
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisClient:
+    """
+    Application wide async Redis client backed by one bounded connection pool.
+
+    Token verification, session caching and the follower leaderboard borrow connections
+    from it instead of connecting for every request. When all REDIS_MAX_CONNECTIONS are
+    busy, callers wait up to REDIS_POOL_TIMEOUT seconds for one to be released.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._pool = None
+
+    @property
+    def client(self) -> Redis:
+        # Started lazily as well, for code paths that run outside the FastAPI lifespan.
+        if self._client is None:
+            self.start()
+        return self._client
+
+    def start(self) -> None:
+        if self._client is not None:
+            return
+        self._pool = BlockingConnectionPool.from_url(
+            f"redis://{settings.REDIS_SERVER}",
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        self._client = Redis.from_pool(self._pool)
+        logger.info("Redis client pool started")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            logger.info("Redis client pool closed")
+        self._client = None
+        self._pool = None
+
+    def to_dict(self) -> dict:
+        if self._pool is None:
+            return dict(started=False, max_connections=settings.REDIS_MAX_CONNECTIONS)
+        in_use = len(self._pool._in_use_connections)
+        idle = len(self._pool._available_connections)
+        return dict(
+            started=True,
+            max_connections=self._pool.max_connections,
+            open_connections=in_use + idle,
+            in_use=in_use,
+            idle=idle,
+        )
+
+
+redis_client = RedisClient()
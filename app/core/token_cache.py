@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class TokenCache:
+    """
+    Process-local cache of verified sessions: session id -> the user's column values, so a
+    repeated token skips Redis and PostgreSQL. Entries live for `ttl` seconds and the least
+    recently used ones are evicted beyond `max_size`.
+
+    Revoking a session or changing a user invalidates the entry in this process only;
+    other processes keep theirs until the TTL runs out, which bounds that staleness.
+    """
+
+    def __init__(self, max_size: int = None, ttl: float = None):
+        self.max_size = max_size or settings.TOKEN_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else settings.TOKEN_CACHE_TTL
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.invalidated = 0
+
+    def get(self, session_id: str) -> Optional[dict]:
+        entry = self.entries.get(session_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[session_id]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(session_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, session_id: str, user_data: dict) -> None:
+        if self.ttl <= 0:
+            return
+        self.entries[session_id] = (time.monotonic() + self.ttl, user_data)
+        self.entries.move_to_end(session_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evicted += 1
+
+    def invalidate(self, session_id: str) -> None:
+        if self.entries.pop(session_id, None) is not None:
+            self.invalidated += 1
+
+    def invalidate_user(self, user_id) -> None:
+        user_id = str(user_id)
+        for session_id in [key for key, (_, data) in self.entries.items() if str(data["id"]) == user_id]:
+            self.invalidate(session_id)
+
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return dict(
+            size=len(self.entries),
+            max_size=self.max_size,
+            ttl=self.ttl,
+            hits=self.hits,
+            misses=self.misses,
+            hit_ratio=round(self.hits / lookups, 3) if lookups else None,
+            evicted=self.evicted,
+            invalidated=self.invalidated,
+        )
+
+
+token_cache = TokenCache()
@@ -2,4 +2,5 @@ from .crud_user import user
 from .querybuilder import Filter
 from .crud_session import session
 from .crud_track import track
-from .crud_follower_history import follower_history
\ No newline at end of file
+from .crud_follower_history import follower_history
+from .crud_follower_rollup import follower_history_hourly, follower_history_daily, rollup_for_window, ROLLUPS
\ No newline at end of file
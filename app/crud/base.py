@@ -4,7 +4,7 @@ from app.db.base_class import Base
 from app.schemas.search import FilterRuleType
 from fastapi.encoders import jsonable_encoder
 from pydantic import UUID4, BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import func, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import desc,asc
 from fastapi import HTTPException
@@ -31,9 +31,38 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
+    def primary_key(self, id: Any) -> Any:
+        """
+        `id` converted to the primary key's Python type (e.g. a UUID string to uuid.UUID),
+        so it matches the keys of the session's identity map. Raises ValueError for invalid ids.
+        """
+        column = inspect(self.model).primary_key[0]
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return id
+        if isinstance(id, python_type):
+            return id
+        try:
+            return python_type(id)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid {self.model.__name__} id {id!r}") from e
+
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
-        result = await db.execute(select(self.model).where(self.model.id == id))
-        return result.scalar_one_or_none()
+        """
+        The row with primary key `id`. The session lives for one request, so a row that was
+        already loaded during the request comes from its identity map without a query.
+        Models with a composite primary key, e.g. the partitioned follower history, are
+        looked up by their `id` column with a query instead.
+        """
+        if len(inspect(self.model).primary_key) > 1:
+            result = await db.execute(select(self.model).where(self.model.id == id))
+            return result.scalars().first()
+        try:
+            key = self.primary_key(id)
+        except ValueError:
+            return None
+        return await db.get(self.model, key)
 
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 1000000
@@ -108,9 +137,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     async def remove(self, db: AsyncSession, *, id: str) -> ModelType:
         # Fetch the object from the database
-        query = select(self.model).where(self.model.id == id)
-        result = await db.execute(query)
-        obj = result.scalar_one_or_none()
+        obj = await self.get(db, id)
 
         if obj is None:
             raise HTTPException(status_code=404, detail=f"{self.model.__name__} with ID {id} not found")
@@ -1,8 +1,12 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, delete, func, insert, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.constants.enums import SocialMediaPlatform
 from app.crud.base import CRUDBase
 from app.models.follower_history import FollowerHistory
+from app.models.track import Track
 from app.schemas.follower_history import FollowerHistoryCreate
 from pydantic.types import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,5 +21,134 @@ class CRUDFollowerHistory(CRUDBase[FollowerHistory, FollowerHistoryCreate, Follo
         result = await db.execute(select(FollowerHistory).where(FollowerHistory.track_id == track_id))
         return result.scalars().first()
 
+    async def create_multi(self, db: AsyncSession, *, rows: List[dict]) -> None:
+        """
+        Insert many history rows with one multi-row INSERT, without committing.
+        """
+        if not rows:
+            return
+        await db.execute(insert(FollowerHistory).values(rows))
+
+    async def get_oldest_created_at(self, db: AsyncSession) -> Optional[datetime]:
+        result = await db.execute(select(func.min(FollowerHistory.created_at)))
+        return result.scalar()
+
+    async def delete_before(self, db: AsyncSession, *, before: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` rows created before `before`, without committing. Unordered, so each
+        batch stops at the first matching rows of the pruned partitions instead of sorting them.
+        """
+        oldest = (
+            select(FollowerHistory.id, FollowerHistory.created_at)
+            .where(FollowerHistory.created_at < before)
+            .limit(limit)
+        )
+        result = await db.execute(
+            delete(FollowerHistory).where(tuple_(FollowerHistory.id, FollowerHistory.created_at).in_(oldest))
+        )
+        return result.rowcount
+
+    def export_query(
+        self, *, track_id: UUID4 = None, user_id: UUID4 = None, since: datetime = None, until: datetime = None
+    ) -> Select:
+        """
+        Raw history rows with their track's platform and profile, in (track_id, created_at) index order.
+        """
+        query = (
+            select(
+                FollowerHistory.track_id,
+                Track.social_media,
+                Track.profile_username,
+                FollowerHistory.created_at,
+                FollowerHistory.follower_count,
+            )
+            .join(Track, Track.id == FollowerHistory.track_id)
+            .order_by(FollowerHistory.track_id, FollowerHistory.created_at)
+        )
+        if track_id is not None:
+            query = query.where(FollowerHistory.track_id == track_id)
+        if user_id is not None:
+            query = query.where(Track.user_id == user_id)
+        if since is not None:
+            query = query.where(FollowerHistory.created_at >= since)
+        if until is not None:
+            query = query.where(FollowerHistory.created_at < until)
+        return query
+
+    async def get_series(
+        self, db: AsyncSession, *, track_id: UUID4, since: datetime, until: datetime, unit: str
+    ) -> list:
+        """
+        (bucket, last count, min count, max count) of a track per date_trunc `unit`, oldest first.
+        """
+        bucket = func.date_trunc(literal_column(f"'{unit}'"), FollowerHistory.created_at).label("bucket")
+        result = await db.execute(
+            select(
+                bucket,
+                func.array_agg(aggregate_order_by(FollowerHistory.follower_count, FollowerHistory.created_at.desc()))[1],
+                func.min(FollowerHistory.follower_count),
+                func.max(FollowerHistory.follower_count),
+            )
+            .where(
+                FollowerHistory.track_id == track_id,
+                FollowerHistory.created_at >= since,
+                FollowerHistory.created_at < until,
+            )
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        return result.all()
+
+    def sample_columns(self) -> tuple:
+        return FollowerHistory.track_id, FollowerHistory.created_at, FollowerHistory.follower_count
+
+    async def get_first_count(self, db: AsyncSession, *, track_id: UUID4, since: datetime) -> Optional[int]:
+        result = await db.execute(
+            select(FollowerHistory.follower_count)
+            .where(FollowerHistory.track_id == track_id, FollowerHistory.created_at >= since)
+            .order_by(FollowerHistory.created_at.asc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_track_samples(self, db: AsyncSession, *, track_id: UUID4, since: datetime) -> list:
+        """
+        (created_at, follower_count) of a track since `since`, oldest first.
+        """
+        result = await db.execute(
+            select(FollowerHistory.created_at, FollowerHistory.follower_count)
+            .where(FollowerHistory.track_id == track_id, FollowerHistory.created_at >= since)
+            .order_by(FollowerHistory.created_at.asc())
+        )
+        return result.all()
+
+    async def get_top_changes(
+        self, db: AsyncSession, *, since: datetime, top_n: int, social_media: SocialMediaPlatform = None
+    ) -> list:
+        """
+        (track_id, change) of the `top_n` tracks with the largest absolute change since `since`,
+        where change is the last minus the first recorded count in the window.
+        """
+        window = dict(partition_by=FollowerHistory.track_id, order_by=FollowerHistory.created_at, range_=(None, None))
+        spans = (
+            select(
+                FollowerHistory.track_id,
+                func.first_value(FollowerHistory.follower_count).over(**window).label("start_count"),
+                func.last_value(FollowerHistory.follower_count).over(**window).label("end_count"),
+            )
+            .where(FollowerHistory.created_at >= since)
+            .distinct()
+        )
+        if social_media is not None:
+            spans = spans.where(
+                FollowerHistory.track_id.in_(select(Track.id).where(Track.social_media == social_media))
+            )
+        spans = spans.subquery()
+        change = (spans.c.end_count - spans.c.start_count).label("change")
+        result = await db.execute(
+            select(spans.c.track_id, change).order_by(func.abs(change).desc()).limit(top_n)
+        )
+        return result.all()
+
 
 follower_history = CRUDFollowerHistory(FollowerHistory)
@@ -0,0 +1,313 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Type
+
+from sqlalchemy import Select, case, delete, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic.types import UUID4
+
+from app.constants.enums import SocialMediaPlatform
+from app.core.config import settings
+from app.crud.base import CRUDBase
+from app.models.follower_history import FollowerHistory
+from app.models.track import Track
+from app.models.follower_rollup import FollowerHistoryDaily, FollowerHistoryHourly
+from app.schemas.follower_history import FollowerHistoryCreate
+
+ROLLUP_COLUMNS = (
+    "track_id", "bucket", "first_count", "last_count", "min_count", "max_count", "sample_count", "first_at", "last_at"
+)
+
+
+class CRUDFollowerRollup(CRUDBase[FollowerHistoryHourly, FollowerHistoryCreate, FollowerHistoryCreate]):
+    """
+    Hourly or daily follower count rollups. Offers the same read queries as crud.follower_history,
+    computed over buckets that start at or after the bucket containing `since`.
+    """
+
+    def __init__(self, model: Type[FollowerHistoryHourly], unit: str, bucket_size: timedelta):
+        super().__init__(model)
+        # date_trunc() field name of the buckets.
+        self.unit = unit
+        self.bucket_size = bucket_size
+
+    def bucket_start(self, value: datetime) -> datetime:
+        if self.unit == "day":
+            return value.replace(hour=0, minute=0, second=0, microsecond=0)
+        return value.replace(minute=0, second=0, microsecond=0)
+
+    def rows_from_samples(self, samples: Iterable) -> List[dict]:
+        """
+        Fold (track_id, follower_count, observed_at) samples into one row per track and bucket,
+        sorted so concurrent writers lock rollup rows in the same order.
+        """
+        rows = {}
+        for track_id, count, observed_at in samples:
+            key = (track_id, self.bucket_start(observed_at))
+            row = rows.get(key)
+            if row is None:
+                rows[key] = dict(
+                    track_id=track_id,
+                    bucket=key[1],
+                    first_count=count,
+                    last_count=count,
+                    min_count=count,
+                    max_count=count,
+                    sample_count=1,
+                    first_at=observed_at,
+                    last_at=observed_at,
+                )
+                continue
+            if observed_at < row["first_at"]:
+                row["first_count"], row["first_at"] = count, observed_at
+            if observed_at >= row["last_at"]:
+                row["last_count"], row["last_at"] = count, observed_at
+            row["min_count"] = min(row["min_count"], count)
+            row["max_count"] = max(row["max_count"], count)
+            row["sample_count"] += 1
+        return [rows[key] for key in sorted(rows, key=lambda key: (str(key[0]), key[1]))]
+
+    async def upsert_multi(self, db: AsyncSession, *, rows: List[dict]) -> None:
+        """
+        Merge rows from rows_from_samples into the stored buckets with one INSERT ... ON CONFLICT, without committing.
+        """
+        if not rows:
+            return
+        table = self.model.__table__
+        stmt = insert(self.model).values(rows)
+        new = stmt.excluded
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.track_id, table.c.bucket],
+                set_=dict(
+                    first_count=case((new.first_at < table.c.first_at, new.first_count), else_=table.c.first_count),
+                    first_at=func.least(table.c.first_at, new.first_at),
+                    last_count=case((new.last_at >= table.c.last_at, new.last_count), else_=table.c.last_count),
+                    last_at=func.greatest(table.c.last_at, new.last_at),
+                    min_count=func.least(table.c.min_count, new.min_count),
+                    max_count=func.greatest(table.c.max_count, new.max_count),
+                    sample_count=table.c.sample_count + new.sample_count,
+                    updated_at=func.now(),
+                ),
+            )
+        )
+
+    def _from_history(self, since: datetime, until: datetime):
+        """
+        INSERT ... SELECT of the buckets between `since` and `until` computed from raw follower_history.
+        """
+        # Inlined rather than bound, so the grouped and the selected expression are identical for PostgreSQL.
+        bucket = func.date_trunc(literal_column(f"'{self.unit}'"), FollowerHistory.created_at)
+        ordered = FollowerHistory.follower_count
+        source = (
+            select(
+                FollowerHistory.track_id,
+                bucket,
+                func.array_agg(aggregate_order_by(ordered, FollowerHistory.created_at.asc()))[1],
+                func.array_agg(aggregate_order_by(ordered, FollowerHistory.created_at.desc()))[1],
+                func.min(ordered),
+                func.max(ordered),
+                func.count(),
+                func.min(FollowerHistory.created_at),
+                func.max(FollowerHistory.created_at),
+            )
+            .where(
+                FollowerHistory.created_at >= since,
+                FollowerHistory.created_at < until,
+                FollowerHistory.track_id.is_not(None),
+            )
+            .group_by(FollowerHistory.track_id, bucket)
+        )
+        return insert(self.model).from_select(list(ROLLUP_COLUMNS), source)
+
+    async def covered_since(self, db: AsyncSession) -> Optional[datetime]:
+        """
+        Start of the first bucket raw follower_history still covers completely, or None without raw history.
+        Retention deletes raw rows before its cutoff in no particular order and may stop halfway, so nothing
+        before the current raw retention cutoff is trusted, and the bucket holding the oldest row may be partial.
+        """
+        oldest = (await db.execute(select(func.min(FollowerHistory.created_at)))).scalar()
+        if oldest is None:
+            return None
+        if settings.FOLLOWER_HISTORY_RAW_RETENTION_DAYS:
+            cutoff = datetime.utcnow() - timedelta(days=settings.FOLLOWER_HISTORY_RAW_RETENTION_DAYS)
+            oldest = max(oldest, cutoff)
+        start = self.bucket_start(oldest)
+        return start if start == oldest else start + self.bucket_size
+
+    async def rebuild(self, db: AsyncSession, *, since: datetime, until: datetime) -> int:
+        """
+        Recompute the buckets between `since` and `until` (both bucket aligned) from raw follower_history,
+        without committing. Returns the number of buckets written.
+
+        Only buckets raw history fully covers are deleted and recomputed; older ones, whose raw rows
+        retention may have deleted, are backfilled where missing and otherwise kept.
+        """
+        covered = await self.covered_since(db)
+        if covered is None or covered >= until:
+            return await self.backfill(db=db, since=since, until=until)
+        written = 0
+        if since < covered:
+            written += await self.backfill(db=db, since=since, until=covered)
+            since = covered
+
+        table = self.model.__table__
+        await db.execute(delete(self.model).where(self.model.bucket >= since, self.model.bucket < until))
+
+        stmt = self._from_history(since, until)
+        # Writers may upsert the current bucket while it is rebuilt; the recomputed values win.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.track_id, table.c.bucket],
+            set_={column: stmt.excluded[column] for column in ROLLUP_COLUMNS[2:]},
+        )
+        result = await db.execute(stmt)
+        return written + result.rowcount
+
+    async def backfill(self, db: AsyncSession, *, since: datetime, until: datetime) -> int:
+        """
+        Add the buckets between `since` and `until` that are missing, e.g. for history written before
+        the rollups existed, keeping the incrementally maintained ones. Does not commit.
+        """
+        stmt = self._from_history(since, until).on_conflict_do_nothing(
+            index_elements=[self.model.__table__.c.track_id, self.model.__table__.c.bucket]
+        )
+        result = await db.execute(stmt)
+        return result.rowcount
+
+    async def delete_before(self, db: AsyncSession, *, before: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` of the oldest buckets that start before `before`, without committing.
+        """
+        oldest = (
+            select(self.model.track_id, self.model.bucket)
+            .where(self.model.bucket < before)
+            .order_by(self.model.bucket)
+            .limit(limit)
+        )
+        result = await db.execute(
+            delete(self.model).where(tuple_(self.model.track_id, self.model.bucket).in_(oldest))
+        )
+        return result.rowcount
+
+    def export_query(
+        self, *, track_id: UUID4 = None, user_id: UUID4 = None, since: datetime = None, until: datetime = None
+    ) -> Select:
+        """
+        Buckets with their track's platform and profile, in primary key order.
+        """
+        query = (
+            select(
+                self.model.track_id,
+                Track.social_media,
+                Track.profile_username,
+                self.model.bucket,
+                self.model.first_count,
+                self.model.last_count,
+                self.model.min_count,
+                self.model.max_count,
+                self.model.sample_count,
+            )
+            .join(Track, Track.id == self.model.track_id)
+            .order_by(self.model.track_id, self.model.bucket)
+        )
+        if track_id is not None:
+            query = query.where(self.model.track_id == track_id)
+        if user_id is not None:
+            query = query.where(Track.user_id == user_id)
+        if since is not None:
+            query = query.where(self.model.bucket >= self.bucket_start(since))
+        if until is not None:
+            query = query.where(self.model.bucket < until)
+        return query
+
+    async def get_series(
+        self, db: AsyncSession, *, track_id: UUID4, since: datetime, until: datetime, unit: str
+    ) -> list:
+        """
+        (bucket, last count, min count, max count) of a track per date_trunc `unit`, which must not be
+        finer than this rollup, oldest first.
+        """
+        bucket = func.date_trunc(literal_column(f"'{unit}'"), self.model.bucket).label("bucket")
+        result = await db.execute(
+            select(
+                bucket,
+                func.array_agg(aggregate_order_by(self.model.last_count, self.model.bucket.desc()))[1],
+                func.min(self.model.min_count),
+                func.max(self.model.max_count),
+            )
+            .where(
+                self.model.track_id == track_id,
+                self.model.bucket >= self.bucket_start(since),
+                self.model.bucket < until,
+            )
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        return result.all()
+
+    def sample_columns(self) -> tuple:
+        # The first sample of every bucket.
+        return self.model.track_id, self.model.first_at, self.model.first_count
+
+    async def get_first_count(self, db: AsyncSession, *, track_id: UUID4, since: datetime) -> Optional[int]:
+        result = await db.execute(
+            select(self.model.first_count)
+            .where(self.model.track_id == track_id, self.model.bucket >= self.bucket_start(since))
+            .order_by(self.model.bucket.asc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_track_buckets(self, db: AsyncSession, *, track_id: UUID4, since: datetime) -> list:
+        """
+        (first_at, first_count, last_at, last_count) of a track's buckets since `since`, oldest first.
+        """
+        result = await db.execute(
+            select(self.model.first_at, self.model.first_count, self.model.last_at, self.model.last_count)
+            .where(self.model.track_id == track_id, self.model.bucket >= self.bucket_start(since))
+            .order_by(self.model.bucket.asc())
+        )
+        return result.all()
+
+    async def get_top_changes(
+        self, db: AsyncSession, *, since: datetime, top_n: int, social_media: SocialMediaPlatform = None
+    ) -> list:
+        """
+        (track_id, change) of the `top_n` tracks with the largest absolute change, where change is the
+        last count of the newest bucket minus the first count of the oldest bucket in the window.
+        """
+        window = dict(partition_by=self.model.track_id, order_by=self.model.bucket, range_=(None, None))
+        spans = (
+            select(
+                self.model.track_id,
+                func.first_value(self.model.first_count).over(**window).label("start_count"),
+                func.last_value(self.model.last_count).over(**window).label("end_count"),
+            )
+            .where(self.model.bucket >= self.bucket_start(since))
+            .distinct()
+        )
+        if social_media is not None:
+            spans = spans.where(self.model.track_id.in_(select(Track.id).where(Track.social_media == social_media)))
+        spans = spans.subquery()
+        change = (spans.c.end_count - spans.c.start_count).label("change")
+        result = await db.execute(
+            select(spans.c.track_id, change).order_by(func.abs(change).desc()).limit(top_n)
+        )
+        return result.all()
+
+
+follower_history_hourly = CRUDFollowerRollup(FollowerHistoryHourly, unit="hour", bucket_size=timedelta(hours=1))
+follower_history_daily = CRUDFollowerRollup(FollowerHistoryDaily, unit="day", bucket_size=timedelta(days=1))
+ROLLUPS = (follower_history_daily, follower_history_hourly)
+
+
+def rollup_for_window(hours: float) -> Optional[CRUDFollowerRollup]:
+    """
+    The coarsest rollup that still covers `hours` with at least ROLLUP_MIN_BUCKETS buckets, so the part
+    of the oldest bucket that lies before the window stays small; None means raw follower_history.
+    """
+    window = timedelta(hours=hours)
+    for rollup in ROLLUPS:
+        if rollup.bucket_size * settings.ROLLUP_MIN_BUCKETS <= window:
+            return rollup
+    return None
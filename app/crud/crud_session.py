@@ -2,6 +2,8 @@ from typing import Any, Dict, Optional, Union
 
 from app.models.user_session import UserSession
 from app.schemas.user_session import UserSessionCreate
+from app.core.redis_client import redis_client
+from app.core.token_cache import token_cache
 from app.crud.base import CRUDBase
 from fastapi.encoders import jsonable_encoder
 from fastapi import HTTPException,status
@@ -9,6 +11,7 @@ from fastapi import HTTPException,status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import exc as orm_exc
+from redis.exceptions import RedisError
 
 
 class CRUDSession(CRUDBase[UserSession, UserSessionCreate, None]):
@@ -44,6 +47,15 @@ class CRUDSession(CRUDBase[UserSession, UserSessionCreate, None]):
                 session.is_revoked = True
                 db.add(session)
                 await db.commit()
+                # verify_token trusts the user data cached in Redis, so the key has to go as well.
+                try:
+                    await redis_client.client.delete(session.session_data)
+                except RedisError:
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="Session revoked but still cached, try again",
+                    )
+                token_cache.invalidate(session.session_data)
                 return True
             return False
         except orm_exc.NoResultFound:
@@ -1,10 +1,13 @@
 import json
-from typing import Any, Dict, Optional, Union
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
 from fastapi import HTTPException,status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from sqlalchemy import func, select
+from sqlalchemy import Integer, UUID, and_, column, func, or_, select, tuple_, type_coerce, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.engine import Row
 
 from app.core.security import get_password_hash
 from app.crud.base import CRUDBase
@@ -15,6 +18,16 @@ from app import crud
 
 
 
+# The columns the follower poller works with, in PolledTrack order.
+POLL_COLUMNS = (
+    Track.id,
+    Track.social_media,
+    Track.profile_username,
+    Track.alert_threshold,
+    Track.last_follower_count,
+)
+
+
 class CRUDTrack(CRUDBase[Track, TrackCreate, TrackUpdate]):
     async def get_by_user_id(self, db: AsyncSession, *, user_id: str) -> Optional[Track]:
         result = await db.execute(select(Track).where(Track.user_id == user_id))
@@ -27,8 +40,7 @@ class CRUDTrack(CRUDBase[Track, TrackCreate, TrackUpdate]):
     async def get_by_track_id(
             self, db: AsyncSession, *, track_id: str
     ) -> Optional[Track]:
-        result = await db.execute(select(Track).where(Track.id == track_id))
-        return result.scalars().first()
+        return await self.get(db, track_id)
 
     async def create(self, db: AsyncSession, *, obj_in: TrackCreate) -> Track:
 
@@ -57,9 +69,155 @@ class CRUDTrack(CRUDBase[Track, TrackCreate, TrackUpdate]):
                 ),
             )
 
-
-
-
+    async def update_last_follower_counts(self, db: AsyncSession, *, counts: Dict[Any, int]) -> None:
+        """
+        Set last_follower_count for many tracks with one UPDATE ... FROM (VALUES ...), without committing.
+        """
+        if not counts:
+            return
+        new_counts = values(
+            column("id", UUID(as_uuid=True)),
+            column("follower_count", Integer),
+            name="new_counts",
+        ).data(list(counts.items()))
+        await db.execute(
+            update(Track)
+            .where(Track.id == new_counts.c.id)
+            .values(last_follower_count=new_counts.c.follower_count, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_first_counts(
+            self,
+            db: AsyncSession,
+            *,
+            sample_columns: tuple,
+            since: List[datetime],
+            user_id: Optional[str] = None,
+            profile_usernames: Optional[List[str]] = None,
+            skip: int = 0,
+            limit: int = 100,
+    ) -> List[Row]:
+        """
+        One page of tracks, ordered by (profile_username, id), with the first sampled count at or after
+        each `since` in a single grouped query. `sample_columns` is the (track_id, observed_at, count)
+        triple of the history source, see crud.follower_history.sample_columns.
+        Rows are (id, social_media, profile_username, last_follower_count, *first counts).
+        """
+        track_id, observed_at, count = sample_columns
+        page = select(Track.id, Track.social_media, Track.profile_username, Track.last_follower_count)
+        if user_id is not None:
+            page = page.where(Track.user_id == user_id)
+        if profile_usernames is not None:
+            page = page.where(Track.profile_username.in_(profile_usernames))
+        page = page.order_by(Track.profile_username, Track.id).offset(skip).limit(limit).subquery()
+
+        ordered_counts = func.array_agg(aggregate_order_by(count, observed_at.asc()))
+        first_counts = [
+            type_coerce(ordered_counts.filter(observed_at >= start), ARRAY(Integer))[1].label(f"first_{i}")
+            for i, start in enumerate(since)
+        ]
+        query = (
+            select(page, *first_counts)
+            .select_from(page.outerjoin(count.table, and_(track_id == page.c.id, observed_at >= min(since))))
+            .group_by(*page.c)
+            .order_by(page.c.profile_username, page.c.id)
+        )
+        result = await db.execute(query)
+        return result.all()
+
+    async def get_poll_chunk(
+            self, db: AsyncSession, *, after: Optional[tuple] = None, limit: int
+    ) -> List[Row]:
+        """
+        One keyset page of alert-enabled tracks as POLL_COLUMNS rows, ordered by
+        (social_media, profile_username, id). Pass the last row's key as `after` for the next page.
+        """
+        query = (
+            select(*POLL_COLUMNS)
+            .where(Track.alert_enabled == True, Track.profile_username.isnot(None))
+            .order_by(Track.social_media, Track.profile_username, Track.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(Track.social_media, Track.profile_username, Track.id) > tuple(after))
+        result = await db.execute(query)
+        return result.all()
+
+    async def get_profile_tracks(self, db: AsyncSession, *, profiles: List[tuple]) -> List[Row]:
+        """
+        The alert-enabled tracks of the given (social_media, profile_username) profiles as POLL_COLUMNS
+        rows, in the poller's (social_media, profile_username, id) index order.
+        """
+        result = await db.execute(
+            select(*POLL_COLUMNS)
+            .where(Track.alert_enabled == True, tuple_(Track.social_media, Track.profile_username).in_(profiles))
+            .order_by(Track.social_media, Track.profile_username, Track.id)
+        )
+        return result.all()
+
+    async def claim_batch(
+            self, db: AsyncSession, *, owner: str, limit: int, lease_seconds: int
+    ) -> List[Row]:
+        """
+        Lease up to `limit` due tracks to `owner`, without committing.
+
+        A track is due when it has no lease or its lease expired, so tracks of a dead
+        worker are taken over once their lease runs out. SKIP LOCKED lets concurrent
+        workers claim disjoint batches without waiting on each other.
+        """
+        due = (
+            select(Track.id)
+            .where(
+                Track.alert_enabled == True,
+                Track.profile_username.isnot(None),
+                or_(Track.leased_until.is_(None), Track.leased_until <= func.now()),
+            )
+            .order_by(Track.leased_until.asc().nulls_first())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            update(Track)
+            .where(Track.id.in_(due))
+            .values(lease_owner=owner, leased_until=func.now() + timedelta(seconds=lease_seconds))
+            .returning(*POLL_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
+
+    async def renew_leases(
+            self, db: AsyncSession, *, owner: str, track_ids: List[Any], lease_seconds: int
+    ) -> int:
+        """
+        Extend the leases `owner` still holds on `track_ids`, without committing.
+        Returns how many leases were extended.
+        """
+        if not track_ids:
+            return 0
+        result = await db.execute(
+            update(Track)
+            .where(Track.id.in_(track_ids), Track.lease_owner == owner)
+            .values(leased_until=func.now() + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def release_leases(
+            self, db: AsyncSession, *, owner: str, track_ids: List[Any], next_poll_seconds: int
+    ) -> None:
+        """
+        Hand polled tracks back, keeping them unclaimable until their next poll is due.
+        """
+        if not track_ids:
+            return
+        await db.execute(
+            update(Track)
+            .where(Track.id.in_(track_ids), Track.lease_owner == owner)
+            .values(lease_owner=None, leased_until=func.now() + timedelta(seconds=next_poll_seconds))
+            .execution_options(synchronize_session=False)
+        )
 
 
 track = CRUDTrack(Track)
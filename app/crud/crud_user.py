@@ -6,7 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from sqlalchemy import func, select
 
-from app.core.security import get_password_hash
+from app.core.password_hasher import password_hasher
+from app.core.token_cache import token_cache
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -27,10 +28,10 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     async def get_by_id(
             self, db: AsyncSession, *, user_id: str
     ) -> Optional[User]:
-        result = await db.execute(select(User).where(User.id == user_id))
-        return result.scalars().first()
+        return await self.get(db, user_id)
 
     async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        hashed_password = await password_hasher.hash(obj_in.password)
 
         try:
 
@@ -38,7 +39,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             db_obj = User(
                 username=obj_in.username,
                 is_active=is_active,
-                hashed_password=get_password_hash(obj_in.password),
+                hashed_password=hashed_password,
                 email = obj_in.email,
             )
 
@@ -68,18 +69,24 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         else:
             update_data = obj_in.dict(exclude_unset=True)
         if update_data.get("password"):
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await password_hasher.hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+        user = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        token_cache.invalidate_user(user.id)
+        return user
+
+    async def remove(self, db: AsyncSession, *, id: str) -> User:
+        user = await super().remove(db, id=id)
+        token_cache.invalidate_user(id)
+        return user
 
     async def authenticate(self, db: AsyncSession, username: str, password: str) -> Optional[User]:
-        from app.core.security import verify_password
         login = False
         user = await self.get_by_username(db, username=username)
         if not user:
             return None, login
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             return user, login
         login = True
         return user, login
@@ -89,6 +96,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user.is_active = is_active
         db.add(user)
         await db.commit()
+        token_cache.invalidate_user(user.id)
         return user
 
 
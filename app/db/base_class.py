@@ -45,7 +45,8 @@ def before_compile(query):
 
 @event.listens_for(SoftDeleteMixin, "load", propagate=True)
 def load(obj, context):
-    include_deleted = context.query._execution_options.get("include_deleted", False)
+    # No context for objects merged without loading, e.g. users restored from the token cache.
+    include_deleted = context is not None and context.query._execution_options.get("include_deleted", False)
     if obj.deleted_at and not include_deleted:
         raise TypeError(
             f"Deleted object {obj} was loaded, did you use joined eager loading?"
@@ -0,0 +1,139 @@
+import logging
+import re
+from datetime import date, datetime
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "follower_history"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})(\d{{2}})$")
+# Serialises partition maintenance between workers; any constant unique to this job works.
+MAINTENANCE_LOCK_ID = 720_431_118
+
+
+def month_start(value: date, months: int = 0) -> date:
+    month = value.year * 12 + value.month - 1 + months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def partition_name(start: date) -> str:
+    return f"{PARENT_TABLE}_p{start:%Y%m}"
+
+
+async def existing_partitions(db: AsyncSession) -> list:
+    result = await db.execute(
+        text(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :parent
+            """
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return result.scalars().all()
+
+
+async def create_month_partition(db: AsyncSession, start: date) -> None:
+    """
+    Attach the monthly partition starting at `start`. Rows that already landed in the default
+    partition for that month are moved first, otherwise attaching would fail.
+    """
+    name = partition_name(start)
+    end = month_start(start, 1)
+    bounds = {"start": datetime.combine(start, datetime.min.time()), "end": datetime.combine(end, datetime.min.time())}
+    await db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    await db.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+        )
+    )
+    logger.info(f"Created partition {name}")
+
+
+async def ensure_partitions(db: AsyncSession, months_ahead: int, today: date = None) -> list:
+    """
+    Make sure monthly partitions exist from the current month up to `months_ahead` months later.
+    """
+    today = today or datetime.utcnow().date()
+    existing = set(await existing_partitions(db))
+    created = []
+    for offset in range(months_ahead + 1):
+        start = month_start(today, offset)
+        if partition_name(start) not in existing:
+            await create_month_partition(db, start)
+            created.append(partition_name(start))
+    return created
+
+
+async def drop_detached_foreign_keys(db: AsyncSession) -> list:
+    """
+    Drop the foreign keys detached partitions keep from follower_history, so deleting a track does not
+    fail on history rows that are no longer part of the table. Also covers partitions detached before.
+    """
+    result = await db.execute(
+        text(
+            """
+            SELECT child.relname, pg_constraint.conname FROM pg_constraint
+            JOIN pg_class child ON child.oid = pg_constraint.conrelid
+            WHERE pg_constraint.contype = 'f' AND NOT child.relispartition AND child.relname LIKE :pattern
+            """
+        ),
+        {"pattern": f"{PARENT_TABLE}_p%"},
+    )
+    dropped = []
+    for table, constraint in result.all():
+        if not PARTITION_NAME.match(table):
+            continue
+        await db.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"'))
+        logger.info(f"Dropped foreign key {constraint} of detached partition {table}")
+        dropped.append(constraint)
+    return dropped
+
+
+async def detach_expired_partitions(
+    db: AsyncSession, retention_months: int, drop: bool = False, today: date = None
+) -> list:
+    """
+    Detach monthly partitions that end before the retention cutoff; drop them as well when `drop` is set.
+    Kept tables lose their foreign key to tracks, they only serve as an archive.
+    """
+    if retention_months <= 0:
+        return []
+    today = today or datetime.utcnow().date()
+    cutoff = month_start(today, -retention_months)
+    expired = []
+    for name in await existing_partitions(db):
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue
+        start = date(int(match.group(1)), int(match.group(2)), 1)
+        if month_start(start, 1) <= cutoff:
+            await db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            if drop:
+                await db.execute(text(f"DROP TABLE {name}"))
+            logger.info(f"{'Dropped' if drop else 'Detached'} expired partition {name}")
+            expired.append(name)
+    await drop_detached_foreign_keys(db)
+    return expired
+
+
+async def maintain_partitions(db: AsyncSession, months_ahead: int, retention_months: int, drop: bool) -> None:
+    """
+    Run partition maintenance in one transaction, holding an advisory lock so concurrent workers take turns.
+    """
+    async with db.begin():
+        await db.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": MAINTENANCE_LOCK_ID})
+        await ensure_partitions(db, months_ahead)
+        await detach_expired_partitions(db, retention_months, drop)
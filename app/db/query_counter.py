@@ -0,0 +1,36 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    """
+    Number of SQL statements run while handling one request.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+
+# Counter of the request being handled; None outside requests, e.g. in the poller.
+request_queries: ContextVar[Optional[QueryCounter]] = ContextVar("request_queries", default=None)
+
+
+def start_request() -> QueryCounter:
+    counter = QueryCounter()
+    request_queries.set(counter)
+    return counter
+
+
+def count_queries(engine: AsyncEngine) -> None:
+    """
+    Add every statement `engine` runs to the counter of the current request.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter = request_queries.get()
+        if counter is not None:
+            counter.count += 1
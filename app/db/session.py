@@ -3,8 +3,11 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from sqlalchemy.orm import sessionmaker
 
+from app.db.query_counter import count_queries
+
 
 engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, future=True, connect_args=settings.connect_args)
+count_queries(engine)
 SessionLocal = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
@@ -10,7 +10,11 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.cors import CORSMiddleware
-from app.tasks.background_task import run_follower_check
+from app.core.http_client import http_client
+from app.core.password_hasher import password_hasher
+from app.core.redis_client import redis_client
+from app.db.query_counter import start_request
+from app.tasks.background_task import follower_check_task, run_partition_maintenance, run_retention
 
 
 class OwnDefaultResponse(JSONResponse):
@@ -51,7 +55,29 @@ app = FastAPI(
 
 @app.on_event("startup")
 async def startup_event():
-    asyncio.create_task(run_follower_check())
+    http_client.start()
+    redis_client.start()
+    password_hasher.start()
+    asyncio.create_task(run_partition_maintenance())
+    asyncio.create_task(run_retention())
+    task = follower_check_task()
+    if task is not None:
+        asyncio.create_task(task)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await http_client.close()
+    await redis_client.close()
+    await password_hasher.close()
+
+
+@app.middleware("http")
+async def count_request_queries(request: Request, call_next):
+    counter = start_request()
+    response = await call_next(request)
+    response.headers["X-Query-Count"] = str(counter.count)
+    return response
 
 
 # Set all CORS enabled origins
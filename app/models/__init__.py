@@ -1,4 +1,5 @@
 from .user import User
 from .user_session import UserSession
 from .track import Track
-from .follower_history import FollowerHistory
\ No newline at end of file
+from .follower_history import FollowerHistory
+from .follower_rollup import FollowerHistoryHourly, FollowerHistoryDaily
\ No newline at end of file
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Boolean, Column, Integer, String, Enum,ForeignKey,DateTime,UUID
+from sqlalchemy import Boolean, Column, Integer, String, Enum,ForeignKey,DateTime,UUID, Index, func
 from sqlalchemy.orm import relationship, column_property, Session
 from app.db.base_class import Base
 
@@ -8,7 +8,14 @@ from app.db.base_class import Base
 
 class FollowerHistory(Base):
     __tablename__ = "follower_history"
+    # Range partitioned by month on created_at, see app/db/partitions.py.
+    __table_args__ = (
+        Index("ix_follower_history_track_id_created_at", "track_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, index=True,default=uuid.uuid4)
+    # Part of the primary key because PostgreSQL requires the partition key in it.
+    created_at = Column(DateTime, primary_key=True, nullable=False, server_default=func.now())
     track_id = Column(UUID(as_uuid=True), ForeignKey("tracks.id"))
     follower_count = Column(Integer)
 
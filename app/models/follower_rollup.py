@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UUID, Index, PrimaryKeyConstraint
+from sqlalchemy.orm import declared_attr
+from app.db.base_class import Base
+
+
+class FollowerRollupMixin:
+    """
+    One row per track and time bucket, kept up to date by the follower history writer.
+    first_at/last_at make the upserts order independent.
+    """
+
+    @declared_attr
+    def __table_args__(cls):
+        return (
+            PrimaryKeyConstraint("track_id", "bucket"),
+            Index(f"ix_{cls.__tablename__}_bucket", "bucket"),
+        )
+
+    @declared_attr
+    def track_id(cls):
+        return Column(UUID(as_uuid=True), ForeignKey("tracks.id", ondelete="CASCADE"), nullable=False)
+
+    bucket = Column(DateTime, nullable=False)
+    first_count = Column(Integer, nullable=False)
+    last_count = Column(Integer, nullable=False)
+    min_count = Column(Integer, nullable=False)
+    max_count = Column(Integer, nullable=False)
+    sample_count = Column(Integer, nullable=False)
+    first_at = Column(DateTime, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+
+
+class FollowerHistoryHourly(FollowerRollupMixin, Base):
+    __tablename__ = "follower_history_hourly"
+
+
+class FollowerHistoryDaily(FollowerRollupMixin, Base):
+    __tablename__ = "follower_history_daily"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Enum,UUID
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Enum,UUID, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from datetime import datetime
@@ -10,6 +10,16 @@ import uuid
 
 class Track(Base):
     __tablename__ = "tracks"
+    __table_args__ = (
+        # Keyset order of the follower poller, see crud.track.get_poll_chunk.
+        Index(
+            "ix_tracks_poll_order",
+            "social_media",
+            "profile_username",
+            "id",
+            postgresql_where=text("alert_enabled"),
+        ),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, index=True,default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"))
     social_media = Column(Enum(SocialMediaPlatform))
@@ -17,5 +27,7 @@ class Track(Base):
     alert_threshold = Column(Integer, default=1000)
     alert_enabled = Column(Boolean, default=True)
     last_follower_count = Column(Integer, default=0)
+    lease_owner = Column(String, nullable=True)
+    leased_until = Column(DateTime, nullable=True, index=True)
     follower_history = relationship("FollowerHistory", back_populates="track", cascade="all, delete-orphan")
     user = relationship("User", back_populates="tracks",foreign_keys=[user_id])
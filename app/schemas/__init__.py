@@ -8,4 +8,5 @@ from .user import (
     UserUpdate,ChangePassword,UserInput
 )
 from .track import *
-from .follower_history import *
\ No newline at end of file
+from .follower_history import *
+from .engagement import *
\ No newline at end of file
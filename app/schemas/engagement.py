@@ -0,0 +1,33 @@
+from typing import Annotated, Dict, List, Optional
+
+from pydantic import ConfigDict, Field, UUID4
+from .BaseSchemaModel import BaseSchemaModel as BaseModel
+
+# Longest engagement window in hours (ten years).
+MAX_ENGAGEMENT_WINDOW_HOURS = 24 * 366 * 10
+
+
+# Properties to receive via API for a bulk engagement request
+class EngagementRequest(BaseModel):
+    # Narrows the current user's tracks to these profiles; None means all of them.
+    profile_usernames: Optional[List[str]] = Field(default=None, max_length=1000)
+    windows: List[Annotated[int, Field(gt=0, le=MAX_ENGAGEMENT_WINDOW_HOURS)]] = Field(
+        default=[24], min_length=1, max_length=10
+    )
+
+
+class TrackEngagement(BaseModel):
+    track_id: UUID4
+    social_media: Optional[str] = None
+    profile_username: Optional[str] = None
+    last_follower_count: Optional[int] = None
+    # Engagement rate per window in hours.
+    engagement_rates: Dict[int, float]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EngagementPage(BaseModel):
+    items: List[TrackEngagement]
+    skip: int
+    limit: int
@@ -0,0 +1,283 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+class SeriesSet(NamedTuple):
+    """
+    Follower samples of several tracks in flat arrays: the samples of track_ids[i] are
+    timestamps/counts[offsets[i]:offsets[i + 1]], oldest first. Timestamps are epoch seconds.
+    """
+
+    track_ids: list
+    offsets: np.ndarray
+    timestamps: np.ndarray
+    counts: np.ndarray
+
+    def track(self, index: int):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.timestamps[start:end], self.counts[start:end]
+
+
+def build_series(track_ids, timestamps, counts) -> SeriesSet:
+    """
+    Group samples that arrive sorted by (track, time) into a SeriesSet.
+    """
+    track_ids = np.asarray(track_ids)
+    if not len(track_ids):
+        return SeriesSet([], np.zeros(1, dtype=np.int64), np.empty(0), np.empty(0))
+    starts = np.flatnonzero(np.r_[True, track_ids[1:] != track_ids[:-1]])
+    return SeriesSet(
+        track_ids=track_ids[starts].tolist(),
+        offsets=np.append(starts, len(track_ids)),
+        timestamps=np.asarray(timestamps, dtype=np.float64),
+        counts=np.asarray(counts, dtype=np.float64),
+    )
+
+
+async def load_series(db: AsyncSession, track_ids: List, since: datetime) -> SeriesSet:
+    """
+    Load the samples of `track_ids` since `since` from the coarsest source that fits the window.
+    """
+    hours = (datetime.utcnow() - since) / timedelta(hours=1)
+    source = crud.rollup_for_window(hours) or crud.follower_history
+    track_id, observed_at, count = source.sample_columns()
+    result = await db.execute(
+        select(track_id, cast(func.extract("epoch", observed_at), Float), count)
+        .where(track_id.in_(track_ids), observed_at >= since)
+        .order_by(track_id, observed_at)
+    )
+    rows = result.all()
+    return build_series(
+        [row[0] for row in rows],
+        np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows)),
+        np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows)),
+    )
+
+
+def growth_rates(series: SeriesSet) -> np.ndarray:
+    """
+    Percent change from the first to the last sample, per track.
+    """
+    first = series.counts[series.offsets[:-1]]
+    last = series.counts[series.offsets[1:] - 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(first > 0, (last - first) / first * 100, 0.0)
+
+
+def growth_per_day(series: SeriesSet) -> np.ndarray:
+    """
+    Least-squares slope of follower count over time in followers per day, per track,
+    from segment sums so all tracks are fitted at once.
+    """
+    starts = series.offsets[:-1]
+    sizes = np.diff(series.offsets).astype(np.float64)
+    # Time relative to each track's first sample, in days, keeps the sums well conditioned.
+    x = (series.timestamps - np.repeat(series.timestamps[starts], sizes.astype(np.int64))) / DAY
+    y = series.counts
+    sum_x = np.add.reduceat(x, starts)
+    sum_y = np.add.reduceat(y, starts)
+    sum_xx = np.add.reduceat(x * x, starts)
+    sum_xy = np.add.reduceat(x * y, starts)
+    denominator = sizes * sum_xx - sum_x ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, (sizes * sum_xy - sum_x * sum_y) / denominator, 0.0)
+
+
+def resample(timestamps: np.ndarray, counts: np.ndarray, step: float, start: float = None, end: float = None):
+    """
+    Counts on a regular grid of `step` seconds, carrying the last observation forward.
+    """
+    start = timestamps[0] if start is None else start
+    end = timestamps[-1] if end is None else end
+    grid = np.arange(start, end + step / 2, step)
+    index = np.searchsorted(timestamps, grid, side="right") - 1
+    return grid, counts[np.clip(index, 0, None)]
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over `window` points, NaN until the window is full.
+    """
+    averages = np.full(len(values), np.nan)
+    if 0 < window <= len(values):
+        sums = np.cumsum(np.r_[0.0, values])
+        averages[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return averages
+
+
+def acceleration(values: np.ndarray, step: float) -> np.ndarray:
+    """
+    Second derivative of a regularly sampled series in followers per hour squared.
+    """
+    if len(values) < 3:
+        return np.zeros(len(values))
+    hours = step / HOUR
+    return np.gradient(np.gradient(values, hours), hours)
+
+
+def rolling_zscores(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Z-score of every change against the mean and deviation of the `window` changes before it;
+    0 until enough history exists or when the history is flat.
+    """
+    changes = np.diff(values)
+    scores = np.zeros(len(changes))
+    if window <= 0 or len(changes) <= window:
+        return scores
+    sums = np.cumsum(np.r_[0.0, changes])
+    squares = np.cumsum(np.r_[0.0, changes ** 2])
+    mean = (sums[window:-1] - sums[:-window - 1]) / window
+    variance = (squares[window:-1] - squares[:-window - 1]) / window - mean ** 2
+    deviation = np.sqrt(np.clip(variance, 0, None))
+    current = changes[window:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores[window:] = np.where(deviation > 0, (current - mean) / deviation, 0.0)
+    return scores
+
+
+def forecast(timestamps: np.ndarray, counts: np.ndarray, horizon: float, step: float):
+    """
+    Linear trend fitted to the samples, extended `horizon` seconds past the last one.
+    Returns the forecast times, counts and the residual standard deviation of the fit.
+    """
+    future = np.arange(timestamps[-1] + step, timestamps[-1] + horizon + step / 2, step)
+    if len(timestamps) < 2 or timestamps[-1] == timestamps[0]:
+        return future, np.full(len(future), counts[-1]), 0.0
+    x = (timestamps - timestamps[0]) / DAY
+    slope, intercept = np.polyfit(x, counts, 1)
+    residuals = counts - (slope * x + intercept)
+    return future, slope * (future - timestamps[0]) / DAY + intercept, float(residuals.std())
+
+
+# date_trunc units of the bucketed series, their approximate size and the finest source that serves them.
+SERIES_UNITS = {
+    "minute": (60.0, "raw"),
+    "hour": (HOUR, "hourly"),
+    "day": (DAY, "daily"),
+    "week": (7 * DAY, "daily"),
+    "month": (30 * DAY, "daily"),
+}
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    `value` as naive UTC like the stored timestamps; naive values are taken to be UTC already.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def series_unit(since: datetime, until: datetime, max_buckets: int) -> str:
+    """
+    The finest unit that covers since..until with at most `max_buckets` buckets.
+    """
+    span = (until - since).total_seconds()
+    for unit, (size, _) in SERIES_UNITS.items():
+        if span / size <= max_buckets:
+            return unit
+    return "month"
+
+
+async def load_bucketed_series(db: AsyncSession, track_id, since: datetime, until: datetime, unit: str) -> list:
+    """
+    (bucket, last count, min count, max count) per `unit`, aggregated in SQL from the matching source.
+    """
+    source = {
+        "raw": crud.follower_history,
+        "hourly": crud.follower_history_hourly,
+        "daily": crud.follower_history_daily,
+    }[SERIES_UNITS[unit][1]]
+    return await source.get_series(db=db, track_id=track_id, since=since, until=until, unit=unit)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling to `threshold` points.
+    The first and last points are always kept; from every bucket in between the point forming the
+    largest triangle with the previously kept point and the average of the next bucket is chosen.
+    """
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+    every = (length - 2) / (threshold - 2)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = previous = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, length)
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+        areas = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[i + 1] = previous
+    kept[-1] = length - 1
+    return kept
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _number(value: float):
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def analyze_track(
+    timestamps: np.ndarray,
+    counts: np.ndarray,
+    step: float,
+    ma_window: int,
+    z_window: int,
+    z_threshold: float,
+    forecast_horizon: float,
+) -> dict:
+    """
+    Growth, moving average, acceleration, change anomalies and forecast for one track's samples.
+    """
+    if not len(counts):
+        return dict(samples=0, growth_rate=0.0, growth_per_day=0.0, series=[], anomalies=[], forecast=[])
+    single = build_series(np.zeros(len(counts)), timestamps, counts)
+    grid, values = resample(timestamps, counts, step)
+    averages = moving_average(values, ma_window)
+    accelerations = acceleration(values, step)
+    scores = rolling_zscores(values, z_window)
+    anomalies = np.flatnonzero(np.abs(scores) >= z_threshold)
+    future, predicted, deviation = forecast(timestamps, counts, forecast_horizon, step)
+    return dict(
+        samples=len(counts),
+        latest_count=int(counts[-1]),
+        growth_rate=_number(growth_rates(single)[0]),
+        growth_per_day=_number(growth_per_day(single)[0]),
+        series=[
+            dict(
+                timestamp=_isoformat(grid[i]),
+                count=int(values[i]),
+                moving_average=_number(averages[i]),
+                acceleration=_number(accelerations[i]),
+            )
+            for i in range(len(grid))
+        ],
+        anomalies=[
+            dict(timestamp=_isoformat(grid[i + 1]), change=int(values[i + 1] - values[i]), zscore=_number(scores[i]))
+            for i in anomalies
+        ],
+        forecast=[
+            dict(timestamp=_isoformat(at), count=_number(count), low=_number(count - 2 * deviation), high=_number(count + 2 * deviation))
+            for at, count in zip(future, predicted)
+        ],
+    )
@@ -1,7 +1,18 @@
-import aiohttp
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import aclosing
 from sqlalchemy.future import select
+from app.core.config import settings
+from app.core.http_client import http_client
+from app.constants.enums import SocialMediaPlatform
 from app.db.session import SessionLocal as AsyncSessionLocal
 from app.models import Track, FollowerHistory
+from app.services.engagement_store import ENGAGEMENT_WINDOWS, engagement_store
+from app.services.history_writer import FollowerHistoryWriter
+from app.services.leaderboard import leaderboard
+from app.services.poll_scheduler import profile_key
+from app.services.rate_limiter import rate_limiter
 from app.services.telegram_message import TelegramNotifier
 from app.services.mock_data import get_mock_follower_count
 from datetime import datetime, timedelta
@@ -10,115 +21,481 @@ import logging
 from app import crud,schemas
 
 
-USE_MOCK_DATA = True
 logging.basicConfig(level=logging.INFO)
 
+
+class PollerStats:
+    """
+    Counters for the follower polling cycles, shared by the background task and the stats API.
+    """
+
+    def __init__(self):
+        self.cycles = 0
+        self.in_flight = 0
+        self.in_flight_by_platform = defaultdict(int)
+        self.last_cycle_started_at = None
+        self.last_cycle_duration = None
+        self.last_cycle_tracks = 0
+        self.last_cycle_profiles = 0
+        self.last_cycle_requests = 0
+        self.last_cycle_succeeded = 0
+        self.last_cycle_failed = 0
+        self.last_cycle_changed = 0
+        self.total_succeeded = 0
+        self.total_failed = 0
+
+    def start_cycle(self):
+        self.last_cycle_started_at = datetime.utcnow()
+        self.last_cycle_tracks = 0
+        self.last_cycle_profiles = 0
+        self.last_cycle_requests = 0
+        self.last_cycle_succeeded = 0
+        self.last_cycle_failed = 0
+        self.last_cycle_changed = 0
+
+    def add_chunk(self, track_count: int, profile_count: int, request_count: int):
+        self.last_cycle_tracks += track_count
+        self.last_cycle_profiles += profile_count
+        self.last_cycle_requests += request_count
+
+    def finish_cycle(self, duration: float):
+        self.cycles += 1
+        self.last_cycle_duration = round(duration, 3)
+
+    def record_result(self, succeeded: bool):
+        if succeeded:
+            self.last_cycle_succeeded += 1
+            self.total_succeeded += 1
+        else:
+            self.last_cycle_failed += 1
+            self.total_failed += 1
+
+    def to_dict(self) -> dict:
+        return dict(
+            cycles=self.cycles,
+            in_flight=self.in_flight,
+            in_flight_by_platform=dict(self.in_flight_by_platform),
+            last_cycle_started_at=self.last_cycle_started_at,
+            last_cycle_duration=self.last_cycle_duration,
+            last_cycle_tracks=self.last_cycle_tracks,
+            last_cycle_profiles=self.last_cycle_profiles,
+            # Tracks served per platform fetch; 1.0 means no profile was tracked twice.
+            last_cycle_dedup_ratio=(
+                round(self.last_cycle_tracks / self.last_cycle_profiles, 2) if self.last_cycle_profiles else None
+            ),
+            last_cycle_requests=self.last_cycle_requests,
+            last_cycle_succeeded=self.last_cycle_succeeded,
+            last_cycle_failed=self.last_cycle_failed,
+            last_cycle_changed=self.last_cycle_changed,
+            total_succeeded=self.total_succeeded,
+            total_failed=self.total_failed,
+        )
+
+
+poller_stats = PollerStats()
+
+
+class PolledTrack:
+    """
+    The columns of a track the poller needs, without ORM state.
+    """
+
+    __slots__ = ("id", "social_media", "profile_username", "alert_threshold", "last_follower_count")
+
+    def __init__(self, id, social_media, profile_username, alert_threshold, last_follower_count):
+        self.id = id
+        self.social_media = social_media
+        self.profile_username = profile_username
+        self.alert_threshold = alert_threshold
+        self.last_follower_count = last_follower_count
+
+
+async def prefetch(chunks):
+    """
+    Iterate the async iterable `chunks`, already loading the next chunk while the caller
+    works on the current one. The pending load is cancelled when iteration stops early.
+    """
+    iterator = chunks.__aiter__()
+    pending = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            try:
+                chunk = await pending
+            except StopAsyncIteration:
+                return
+            pending = asyncio.ensure_future(iterator.__anext__())
+            yield chunk
+    finally:
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+        await iterator.aclose()
+
+
 class FollowerChecker:
+    history_writer_class = FollowerHistoryWriter
+
     def __init__(self):
         self.telegram = TelegramNotifier()
         self.db = AsyncSessionLocal()
+        self.stats = poller_stats
+        self.global_limit = asyncio.Semaphore(settings.FOLLOWER_CHECKER_CONCURRENCY)
+        self.platform_limits = {
+            platform: asyncio.Semaphore(
+                settings.FOLLOWER_CHECKER_PLATFORM_CONCURRENCY.get(
+                    platform.value, settings.FOLLOWER_CHECKER_CONCURRENCY
+                )
+            )
+            for platform in SocialMediaPlatform
+        }
 
 
+    async def request_platform(self, social_media: str, url: str, params: dict = None):
+        """
+        GET a platform endpoint through the rate limiter, retrying after 429 responses.
+        Returns the decoded JSON body, or None when the request failed.
+
+        A global slot is held only for the HTTP request itself: token waits and 429 backoffs
+        happen before it is taken, so a throttled platform does not starve the others.
+        """
+        for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+            await rate_limiter.acquire(social_media)
+            async with self.global_limit:
+                async with http_client.session.get(url, params=params) as response:
+                    rate_limiter.update(social_media, response.headers)
+                    if response.status == 429:
+                        delay = rate_limiter.backoff(social_media, attempt, response.headers)
+                        logging.warning(f"⏳ {social_media} rate limited, backing off {delay:.1f}s")
+                        continue
+                    if response.status == 200:
+                        return await response.json()
+                    return None
+        return None
+
     async def fetch_follower_count(self, social_media, profile_username):
-        if USE_MOCK_DATA:
+        if settings.USE_MOCK_DATA:
             return get_mock_follower_count(social_media, profile_username)
 
         API_URLS = {
-            "Instagram": f"https://api.instagram.com/v1/users/{profile_username}/followers",
-            "Twitter": f"https://api.twitter.com/2/users/by/username/{profile_username}"
+            "Instagram": f"{settings.INSTAGRAM_API_URL}/v1/users/{profile_username}/followers",
+            "Twitter": f"{settings.TWITTER_API_URL}/2/users/by/username/{profile_username}"
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(API_URLS.get(social_media)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("followers_count", 0)
-                return None
+        data = await self.request_platform(social_media, API_URLS.get(social_media))
+        if data is None:
+            return None
+        return data.get("followers_count", 0)
 
-    async def check_followers(self):
-        logging.info("🔄 Running inside follower check task...****************")
+    async def fetch_follower_counts(self, social_media, profile_usernames) -> dict:
+        """
+        Fetch many profiles of one platform with a single lookup request. The platform's batch
+        endpoint takes at most PLATFORM_BATCH_SIZES[social_media] usernames; platforms without one
+        are fetched profile by profile. Returns {profile_username: count or None}.
+        """
+        if settings.USE_MOCK_DATA:
+            return {username: get_mock_follower_count(social_media, username) for username in profile_usernames}
+        if settings.PLATFORM_BATCH_SIZES.get(social_media, 1) <= 1 or len(profile_usernames) == 1:
+            return {
+                username: await self.fetch_follower_count(social_media, username)
+                for username in profile_usernames
+            }
 
-        result = await self.db.execute(select(Track).where(Track.alert_enabled == True))
-        tracks = result.scalars().all()
-        logging.info(tracks)
+        data = await self.request_platform(
+            social_media,
+            f"{settings.TWITTER_API_URL}/2/users/by",
+            params={"usernames": ",".join(profile_usernames), "user.fields": "public_metrics"},
+        )
+        counts = dict.fromkeys(profile_usernames)
+        if data is None:
+            return counts
+        # The platform answers with canonical casing, so match usernames case-insensitively.
+        requested = {username.lower(): username for username in profile_usernames}
+        for user in data.get("data", []):
+            username = requested.get(str(user.get("username", "")).lower())
+            if username is not None:
+                metrics = user.get("public_metrics", user)
+                counts[username] = metrics.get("followers_count", 0)
+        return counts
 
-        for track in tracks:
-            logging.info(track.profile_username)
-
-            new_follower_count = await self.fetch_follower_count(track.social_media, track.profile_username)
-            if new_follower_count is not None and new_follower_count != track.last_follower_count:
-                logging.info("inside check tracks........")
-                follower_history_in = schemas.FollowerHistoryCreate(
-                    track_id=track.id,
-                    follower_count=new_follower_count
-                )
-                follower_history = await crud.follower_history.create(db=self.db, obj_in=follower_history_in)
-                await self.db.commit()
+    async def fetch_bounded(self, platform: SocialMediaPlatform, profile_usernames: list):
+        """
+        Fetch one batch of profiles while holding its platform slot.
+        Returns the platform together with {profile_username: count or None}.
+        """
+        # Global slots are taken per HTTP request in request_platform, after any rate-limit wait,
+        # so a saturated or throttled platform only ever holds its own slots while it waits.
+        async with self.platform_limits[platform]:
+            self.stats.in_flight += 1
+            self.stats.in_flight_by_platform[platform.value] += 1
+            try:
+                return platform, await self.fetch_follower_counts(platform.value, profile_usernames)
+            except Exception as e:
+                logging.error(f"❌ Fetching {len(profile_usernames)} {platform.value} profiles failed: {e}")
+                return platform, dict.fromkeys(profile_usernames)
+            finally:
+                self.stats.in_flight -= 1
+                self.stats.in_flight_by_platform[platform.value] -= 1
 
-                track.last_follower_count = new_follower_count
-                await self.db.add(track)
-                await self.db.commit()
-                await self.db.refresh(track)
+    def batch_profiles(self, profiles) -> list:
+        """
+        Split the distinct (platform, profile_username) keys into per-platform lookup batches.
+        """
+        by_platform = defaultdict(list)
+        for platform, profile_username in profiles:
+            by_platform[platform].append(profile_username)
 
-                if new_follower_count >= track.alert_threshold:
-                    await self.telegram.send_alert(track.profile_username, track.alert_threshold)
+        batches = []
+        for platform, usernames in by_platform.items():
+            size = max(1, settings.PLATFORM_BATCH_SIZES.get(platform.value, 1))
+            batches.extend((platform, usernames[i:i + size]) for i in range(0, len(usernames), size))
+        return batches
 
-        await self.db.commit()
+    async def iter_track_chunks(self, chunk_size: int = None):
+        """
+        Yield alert-enabled tracks as lists of PolledTrack, one keyset-paginated query per chunk.
+        Chunks follow (platform, profile_username, id) order and cut at `chunk_size` rows, so the
+        tracks of one profile can be split over two consecutive chunks; every track is yielded once.
+        """
+        chunk_size = chunk_size or settings.POLL_CHUNK_SIZE
+        after = None
+        while True:
+            # A session per chunk: no connection or transaction is held while the chunk is polled.
+            async with AsyncSessionLocal() as db:
+                rows = await crud.track.get_poll_chunk(db=db, after=after, limit=chunk_size)
+            if not rows:
+                return
+            yield [PolledTrack(*row) for row in rows]
+            if len(rows) < chunk_size:
+                return
+            last = rows[-1]
+            after = (last.social_media, last.profile_username, last.id)
 
-    async def get_top_changes(self, hours=24, top_n=5):
-        time_threshold = datetime.utcnow() - timedelta(hours=hours)
+    async def load_schedule(self, scheduler) -> int:
+        """
+        Sync `scheduler` with the alert-enabled tracks one chunk at a time, so only a chunk of
+        query rows is held on top of the scheduler's own per-profile state. Returns the track count.
+        """
+        count = 0
+        scheduler.start_sync()
+        async for chunk in self.iter_track_chunks():
+            scheduler.sync_chunk(chunk)
+            count += len(chunk)
+        # Not reached when a chunk fails to load, so an incomplete refresh never drops tracks.
+        scheduler.finish_sync()
+        logging.info(f"{count} tracks of {len(scheduler)} profiles to check")
+        return count
+
+    async def iter_due_tracks(self, profiles: list, chunk_size: int = None):
+        """
+        Yield the alert-enabled tracks of the given (platform, profile_username) profiles as lists
+        of PolledTrack, loading the tracks of `chunk_size` profiles per query.
+        """
+        chunk_size = chunk_size or settings.POLL_CHUNK_SIZE
+        for start in range(0, len(profiles), chunk_size):
+            async with AsyncSessionLocal() as db:
+                rows = await crud.track.get_profile_tracks(db=db, profiles=profiles[start:start + chunk_size])
+            yield [PolledTrack(*row) for row in rows]
+
+    async def check_leased_followers(self, owner: str) -> int:
+        """
+        Claim one batch of due tracks for `owner`, poll it and release the leases.
+        Returns how many tracks were claimed.
+        """
+        async with AsyncSessionLocal() as db:
+            async with db.begin():
+                rows = await crud.track.claim_batch(
+                    db=db,
+                    owner=owner,
+                    limit=settings.TRACK_LEASE_BATCH_SIZE,
+                    lease_seconds=settings.TRACK_LEASE_SECONDS,
+                )
+        tracks = [PolledTrack(*row) for row in rows]
+        if not tracks:
+            return 0
+        logging.info(f"{owner} claimed {len(tracks)} tracks")
+
+        # On failure the leases are left to expire, so the batch is retried by any worker.
+        renewal = asyncio.create_task(self.renew_leases(owner, [track.id for track in tracks]))
+        try:
+            await self.poll_tracks(tracks)
+        finally:
+            renewal.cancel()
+            await asyncio.gather(renewal, return_exceptions=True)
 
-        async with self.db as session:
-            async with session.begin():
-                result = await session.execute(
-                    select(FollowerHistory.track_id, FollowerHistory.follower_count)
-                    .where(FollowerHistory.created_at >= time_threshold)
-                    .order_by(FollowerHistory.created_at.desc())
+        async with AsyncSessionLocal() as db:
+            async with db.begin():
+                await crud.track.release_leases(
+                    db=db,
+                    owner=owner,
+                    track_ids=[track.id for track in tracks],
+                    next_poll_seconds=settings.FOLLOWER_CHECKER_INTERVAL,
                 )
-                rows = result.fetchall()
+        return len(tracks)
+
+    async def renew_leases(self, owner: str, track_ids: list) -> None:
+        """
+        Extend the leases on `track_ids` every third of TRACK_LEASE_SECONDS until cancelled, so a
+        batch held up by rate limits is not claimed and polled again by another worker meanwhile.
+        """
+        while True:
+            await asyncio.sleep(settings.TRACK_LEASE_SECONDS / 3)
+            try:
+                async with AsyncSessionLocal() as db:
+                    async with db.begin():
+                        renewed = await crud.track.renew_leases(
+                            db=db, owner=owner, track_ids=track_ids, lease_seconds=settings.TRACK_LEASE_SECONDS
+                        )
+            except Exception as e:
+                logging.warning(f"{owner} could not renew its leases: {e}")
+                continue
+            if renewed < len(track_ids):
+                logging.warning(f"{owner} lost {len(track_ids) - renewed} of {len(track_ids)} leases")
 
-        changes = {}
-        for track_id, count in rows:
-            if track_id in changes:
-                changes[track_id]["end"] = count
-            else:
-                changes[track_id] = {"start": count, "end": count}
+    async def poll_tracks(self, tracks):
+        """
+        Poll the given tracks as one cycle.
+        Returns (track, new follower count or None) for every polled track.
+        """
+        async def chunks():
+            yield tracks
 
-        result_changes = [
-            {"track_id": track_id, "change": data["end"] - data["start"]}
-            for track_id, data in changes.items()
-        ]
+        return await self.poll_cycle(chunks())
 
-        result_changes.sort(key=lambda x: abs(x["change"]), reverse=True)
+    async def poll_due(self, profiles: list):
+        """
+        Poll every track of the given (platform, profile_username) profiles as one cycle, loading the
+        tracks chunk by chunk while the previous chunk is fetched.
+        Returns (track, new follower count or None) per polled track.
+        """
+        return await self.poll_cycle(self.iter_due_tracks(profiles))
+
+    async def poll_cycle(self, chunks):
+        """
+        Poll every chunk of tracks the async iterable `chunks` yields, prefetching the next chunk
+        while one is polled, and flush the history writer once at the end.
+        """
+        started = time.monotonic()
+        self.stats.start_cycle()
+        writer = self.history_writer_class()
+        results = []
+        try:
+            async with aclosing(prefetch(chunks)) as prefetched:
+                async for tracks in prefetched:
+                    await self.poll_chunk(tracks, writer, results)
+            await self.send_alerts(await writer.flush())
+        finally:
+            self.stats.finish_cycle(time.monotonic() - started)
+            logging.info(f"✅ Follower check finished: {self.stats.to_dict()}")
+        return results
+
+    async def poll_chunk(self, tracks, writer, results: list = None):
+        """
+        Fetch every distinct profile of the chunk once, in concurrent per-platform lookup batches,
+        and fan each result out to all tracks of that profile in completion order. Changed counts
+        go through the writer and alerts are sent once a batch is stored.
+        """
+        profiles = defaultdict(list)
+        for track in tracks:
+            profiles[profile_key(track)].append(track)
+        batches = self.batch_profiles(profiles)
+        self.stats.add_chunk(len(tracks), len(profiles), len(batches))
 
-        return result_changes[:top_n]
+        fetches = [asyncio.create_task(self.fetch_bounded(*batch)) for batch in batches]
+        try:
+            for fetched in asyncio.as_completed(fetches):
+                platform, counts = await fetched
+                for profile_username, new_follower_count in counts.items():
+                    self.stats.record_result(new_follower_count is not None)
+                    for track in profiles.get((platform, profile_username), ()):
+                        if results is not None:
+                            results.append((track, new_follower_count))
+                        if new_follower_count is not None:
+                            engagement_store.record(track.id, track.profile_username, new_follower_count)
+                        if new_follower_count is not None and new_follower_count != track.last_follower_count:
+                            self.stats.last_cycle_changed += 1
+                            await self.send_alerts(await writer.add(track, new_follower_count))
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
+
+    async def send_alerts(self, written):
+        if written:
+            await leaderboard.record(written)
+        for entry in written:
+            track = entry.track
+            track.last_follower_count = entry.follower_count
+            if track.alert_threshold is not None and entry.follower_count >= track.alert_threshold:
+                await self.telegram.send_alert(track.profile_username, track.alert_threshold)
+
+    async def get_top_changes(self, hours=24, top_n=5, social_media: SocialMediaPlatform = None):
+        changes = await leaderboard.top(hours, top_n, social_media)
+        if changes is not None:
+            return changes
+
+        time_threshold = datetime.utcnow() - timedelta(hours=hours)
+        source = crud.rollup_for_window(hours) or crud.follower_history
 
-    async def get_engagement(self, profile_username: str):
         async with AsyncSessionLocal() as session:
-            async with session.begin():
-                track = await crud.track.get_by_profile_username(db=self.db, profile_username=profile_username)
+            rows = await source.get_top_changes(
+                db=session, since=time_threshold, top_n=top_n, social_media=social_media
+            )
 
-                if not track:
-                    return None
+        return [{"track_id": track_id, "change": change} for track_id, change in rows]
 
-                time_threshold = datetime.utcnow() - timedelta(hours=24)
-                history_result = await session.execute(
-                    select(FollowerHistory.follower_count)
-                    .where(FollowerHistory.track_id == track.id, FollowerHistory.created_at >= time_threshold)
-                    .order_by(FollowerHistory.created_at.asc())
-                )
+    async def get_engagement(self, profile_username: str, hours: int = 24):
+        if engagement_store.enabled and hours in ENGAGEMENT_WINDOWS:
+            return await engagement_store.get_engagement(profile_username, hours)
 
-                history = history_result.scalars().all()
-                if not history:
-                    return 0.0
+        async with AsyncSessionLocal() as session:
+            track = await crud.track.get_by_profile_username(db=session, profile_username=profile_username)
+
+            if not track:
+                return None
 
-                first_count = history[0]
-                last_count = track.last_follower_count
+            time_threshold = datetime.utcnow() - timedelta(hours=hours)
+            source = crud.rollup_for_window(hours) or crud.follower_history
+            first_count = await source.get_first_count(db=session, track_id=track.id, since=time_threshold)
+            if first_count is None:
+                return 0.0
 
-                follower_change = abs(last_count - first_count)
-                engagement_rate = (follower_change / last_count) * 100 if last_count > 0 else 0
+            last_count = track.last_follower_count
 
-                return round(engagement_rate, 2)
+            follower_change = abs(last_count - first_count)
+            engagement_rate = (follower_change / last_count) * 100 if last_count > 0 else 0
 
+            return round(engagement_rate, 2)
 
+    async def get_engagements(self, windows, user_id=None, profile_usernames=None, skip=0, limit=100):
+        """
+        Engagement rates of one page of tracks for every window in `windows` (hours), computed as in
+        get_engagement but with one grouped query for the whole page.
+        """
+        now = datetime.utcnow()
+        source = crud.rollup_for_window(min(windows)) or crud.follower_history
+
+        async with AsyncSessionLocal() as session:
+            rows = await crud.track.get_first_counts(
+                db=session,
+                sample_columns=source.sample_columns(),
+                since=[now - timedelta(hours=hours) for hours in windows],
+                user_id=user_id,
+                profile_usernames=profile_usernames,
+                skip=skip,
+                limit=limit,
+            )
 
+        engagements = []
+        for track_id, social_media, profile_username, last_count, *first_counts in rows:
+            rates = {}
+            for hours, first_count in zip(windows, first_counts):
+                if first_count is None or not last_count:
+                    rates[hours] = 0.0
+                else:
+                    rates[hours] = round(abs(last_count - first_count) / last_count * 100, 2)
+            engagements.append(dict(
+                track_id=track_id,
+                social_media=social_media,
+                profile_username=profile_username,
+                last_follower_count=last_count,
+                engagement_rates=rates,
+            ))
+        return engagements
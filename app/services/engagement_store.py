@@ -0,0 +1,193 @@
+import logging
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal as AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Windows answered from memory, in hours.
+ENGAGEMENT_WINDOWS = (1, 24, 24 * 7)
+
+
+def epoch(value: datetime) -> float:
+    # History timestamps are naive UTC.
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class WindowRing:
+    """
+    Fixed-size ring of time slots covering one window. Each slot keeps the first sample seen in it,
+    which is all an engagement query needs: the first count at or after the window start.
+    """
+
+    __slots__ = ("window", "slot_seconds", "slots", "timestamps", "counts")
+
+    def __init__(self, window: float, slot_count: int):
+        self.window = window
+        self.slot_seconds = window / slot_count
+        # One spare slot, so the slot holding the window start is still there.
+        size = slot_count + 1
+        self.slots = array("q", [-1]) * size
+        self.timestamps = array("d", [0.0]) * size
+        self.counts = array("q", [0]) * size
+
+    def add(self, timestamp: float, count: int):
+        slot = int(timestamp // self.slot_seconds)
+        index = slot % len(self.slots)
+        stored = self.slots[index]
+        if slot > stored or (slot == stored and timestamp < self.timestamps[index]):
+            self.slots[index] = slot
+            self.timestamps[index] = timestamp
+            self.counts[index] = count
+
+    def first_count(self, now: float):
+        """
+        First count at or after now - window, or None when the window holds no sample.
+        """
+        start = now - self.window
+        first_slot = int(start // self.slot_seconds)
+        size = len(self.slots)
+        for slot in range(first_slot, int(now // self.slot_seconds) + 1):
+            index = slot % size
+            if self.slots[index] == slot and self.timestamps[index] >= start:
+                return self.counts[index]
+        return None
+
+
+class TrackSeries:
+    __slots__ = ("rings", "last_count", "updated_at", "hydrated")
+
+    def __init__(self):
+        self.rings = [
+            WindowRing(hours * 3600, settings.ENGAGEMENT_STORE_SLOTS) for hours in ENGAGEMENT_WINDOWS
+        ]
+        self.last_count = None
+        self.updated_at = 0.0
+        self.hydrated = False
+
+    def add(self, timestamp: float, count: int):
+        for ring in self.rings:
+            ring.add(timestamp, count)
+        if timestamp >= self.updated_at:
+            self.last_count = count
+            self.updated_at = timestamp
+
+
+class EngagementStore:
+    """
+    Recent follower counts per track, fed by the poller, so engagement for the standard windows is
+    answered without querying PostgreSQL. Tracks are hydrated from history on first use, kept in
+    least recently updated order and evicted when idle or when the store exceeds its track limit.
+    """
+
+    def __init__(self, max_tracks: int = None, idle_seconds: float = None):
+        self.max_tracks = max_tracks or settings.ENGAGEMENT_STORE_MAX_TRACKS
+        self.idle_seconds = idle_seconds or settings.ENGAGEMENT_STORE_IDLE_SECONDS
+        self.series = OrderedDict()
+        self.profiles = {}
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    @property
+    def enabled(self) -> bool:
+        # Leased pollers only see their own share of the tracks, so memory would miss samples.
+        return settings.ENGAGEMENT_STORE_ENABLED and settings.FOLLOWER_CHECKER_MODE == "local"
+
+    def _series(self, track_id, profile_username: str) -> TrackSeries:
+        series = self.series.get(track_id)
+        if series is None:
+            series = self.series[track_id] = TrackSeries()
+        self.profiles[profile_username] = track_id
+        return series
+
+    def record(self, track_id, profile_username: str, count: int, timestamp: float = None):
+        if not self.enabled:
+            return
+        timestamp = timestamp or time.time()
+        self._series(track_id, profile_username).add(timestamp, count)
+        self.series.move_to_end(track_id)
+        self.evict(timestamp)
+
+    def evict(self, now: float = None):
+        """
+        Drop tracks that were not updated within idle_seconds, then the least recently updated
+        ones until the store is back under max_tracks.
+        """
+        now = now or time.time()
+        while self.series:
+            track_id, series = next(iter(self.series.items()))
+            if len(self.series) <= self.max_tracks and now - series.updated_at < self.idle_seconds:
+                break
+            del self.series[track_id]
+            self.evicted += 1
+        if len(self.profiles) > 2 * len(self.series):
+            self.profiles = {name: track_id for name, track_id in self.profiles.items() if track_id in self.series}
+
+    async def hydrate(self, db, track) -> TrackSeries:
+        """
+        Load a track's recent history: raw samples for the shortest window and the first and last count
+        of every hourly rollup bucket for the longer ones.
+        """
+        series = self._series(track.id, track.profile_username)
+        now = datetime.utcnow()
+        hourly = await crud.follower_history_hourly.get_track_buckets(
+            db=db, track_id=track.id, since=now - timedelta(hours=ENGAGEMENT_WINDOWS[-1])
+        )
+        for first_at, first_count, last_at, last_count in hourly:
+            series.add(epoch(first_at), first_count)
+            series.add(epoch(last_at), last_count)
+        samples = await crud.follower_history.get_track_samples(
+            db=db, track_id=track.id, since=now - timedelta(hours=ENGAGEMENT_WINDOWS[0])
+        )
+        for created_at, count in samples:
+            series.add(epoch(created_at), count)
+        if track.last_follower_count is not None and series.last_count is None:
+            series.last_count = track.last_follower_count
+        series.hydrated = True
+        self.series.move_to_end(track.id)
+        return series
+
+    async def get_engagement(self, profile_username: str, hours: int):
+        """
+        Engagement rate over `hours` as computed by FollowerChecker.get_engagement, None when the
+        profile is not tracked. Raises ValueError for windows the store does not keep.
+        """
+        window = ENGAGEMENT_WINDOWS.index(hours)
+        track_id = self.profiles.get(profile_username)
+        series = self.series.get(track_id)
+        if series is not None and series.hydrated:
+            self.hits += 1
+        else:
+            self.misses += 1
+            async with AsyncSessionLocal() as db:
+                track = await crud.track.get_by_profile_username(db=db, profile_username=profile_username)
+                if not track:
+                    return None
+                series = await self.hydrate(db, track)
+
+        first_count = series.rings[window].first_count(time.time())
+        last_count = series.last_count
+        if first_count is None or last_count is None:
+            return 0.0
+        follower_change = abs(last_count - first_count)
+        engagement_rate = (follower_change / last_count) * 100 if last_count > 0 else 0
+        return round(engagement_rate, 2)
+
+    def to_dict(self) -> dict:
+        return dict(
+            enabled=self.enabled,
+            tracks=len(self.series),
+            max_tracks=self.max_tracks,
+            hits=self.hits,
+            misses=self.misses,
+            evicted=self.evicted,
+        )
+
+
+engagement_store = EngagementStore()
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal as AsyncSessionLocal
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ExportResolution(str, Enum):
+    RAW = "raw"
+    HOURLY = "hourly"
+    DAILY = "daily"
+
+
+EXPORT_SOURCES = {
+    ExportResolution.RAW: crud.follower_history,
+    ExportResolution.HOURLY: crud.follower_history_hourly,
+    ExportResolution.DAILY: crud.follower_history_daily,
+}
+MEDIA_TYPES = {ExportFormat.CSV: "text/csv", ExportFormat.NDJSON: "application/x-ndjson"}
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def _csv_lines(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _ndjson_lines(header, rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(header, (_value(value) for value in row)))) + "\n" for row in rows
+    )
+
+
+async def export_history(
+    resolution: ExportResolution = ExportResolution.RAW,
+    export_format: ExportFormat = ExportFormat.CSV,
+    compress: bool = False,
+    **filters,
+) -> AsyncIterator[bytes]:
+    """
+    Stream follower history as CSV or NDJSON chunks, optionally gzip compressed.
+
+    Rows come from a server-side cursor, EXPORT_BATCH_SIZE at a time, and every batch is
+    encoded and sent before the next one is fetched, so memory does not grow with the export.
+    `filters` are passed to the source's export_query (track_id, user_id, since, until).
+    """
+    query = EXPORT_SOURCES[resolution].export_query(**filters)
+    header = [column.name for column in query.selected_columns]
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+
+    def output(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    if export_format == ExportFormat.CSV:
+        encode = _csv_lines
+        yield output(_csv_lines([header]))
+    else:
+        def encode(rows):
+            return _ndjson_lines(header, rows)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            chunk = output(encode(rows))
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,77 @@
+import time
+import uuid
+import logging
+from collections import namedtuple
+from datetime import datetime
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal as AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+PendingWrite = namedtuple("PendingWrite", ["track", "follower_count", "observed_at"])
+
+
+class FollowerHistoryWriter:
+    """
+    Buffers poll results and writes them in one transaction per flush:
+    a multi-row INSERT into follower_history, an upsert of the hourly and daily
+    rollups and a single UPDATE of tracks.
+
+    A flush happens when the buffer reaches `batch_size` entries or when the
+    oldest buffered entry is older than `flush_interval` seconds; the poller
+    flushes whatever is left at the end of each cycle.
+    """
+
+    def __init__(self, batch_size: int = None, flush_interval: float = None):
+        self.batch_size = batch_size or settings.FOLLOWER_HISTORY_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.FOLLOWER_HISTORY_FLUSH_INTERVAL
+        self.buffer = []
+        self._oldest = None
+
+    def __len__(self):
+        return len(self.buffer)
+
+    async def add(self, track, follower_count: int) -> list:
+        """
+        Buffer a new follower count. Returns the flushed entries when this add triggered a flush.
+        """
+        if not self.buffer:
+            self._oldest = time.monotonic()
+        self.buffer.append(PendingWrite(track, follower_count, datetime.utcnow()))
+
+        if len(self.buffer) >= self.batch_size or time.monotonic() - self._oldest >= self.flush_interval:
+            return await self.flush()
+        return []
+
+    async def flush(self) -> list:
+        if not self.buffer:
+            return []
+        pending, self.buffer = self.buffer, []
+
+        history_rows = [
+            dict(
+                id=uuid.uuid4(),
+                track_id=entry.track.id,
+                follower_count=entry.follower_count,
+                created_at=entry.observed_at,
+            )
+            for entry in pending
+        ]
+        samples = [(entry.track.id, entry.follower_count, entry.observed_at) for entry in pending]
+        # Later entries win when a track was buffered more than once.
+        counts = {entry.track.id: entry.follower_count for entry in pending}
+
+        try:
+            async with AsyncSessionLocal() as db:
+                async with db.begin():
+                    await crud.follower_history.create_multi(db=db, rows=history_rows)
+                    for rollup in crud.ROLLUPS:
+                        await rollup.upsert_multi(db=db, rows=rollup.rows_from_samples(samples))
+                    await crud.track.update_last_follower_counts(db=db, counts=counts)
+        except Exception:
+            logger.exception(f"Writing {len(pending)} follower counts failed")
+            raise
+
+        logger.info(f"💾 Wrote {len(history_rows)} follower history rows")
+        return pending
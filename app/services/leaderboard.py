@@ -0,0 +1,146 @@
+import logging
+import time
+from datetime import timezone
+
+from redis.asyncio import Redis
+
+from app.constants.enums import SocialMediaPlatform
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Windows kept in Redis, in hours.
+LEADERBOARD_WINDOWS = (1, 24, 24 * 7)
+ALL_PLATFORMS = "all"
+
+
+class FollowerLeaderboard:
+    """
+    Redis sorted sets of follower change per track, one per standard window and platform.
+
+    Every stored change is added to the window's total and to the time slice it happened in.
+    Once a slice is older than the window its set is subtracted from the total, so the total
+    always holds the change over the last window (plus at most one slice). Slices are claimed
+    with SET NX before they are subtracted, so several pollers can share one leaderboard.
+    """
+
+    def __init__(self, prefix: str = "leaderboard:followers"):
+        self.prefix = prefix
+
+    @property
+    def redis(self) -> Redis:
+        return redis_client.client
+
+    @property
+    def enabled(self) -> bool:
+        return settings.LEADERBOARD_ENABLED
+
+    def key(self, hours: int, scope: str) -> str:
+        return f"{self.prefix}:{hours}h:{scope}"
+
+    @staticmethod
+    def slice_seconds(hours: int) -> float:
+        return hours * 3600 / settings.LEADERBOARD_SLICES
+
+    async def record(self, written) -> None:
+        """
+        Add the changes of freshly written poll results. Must run before the tracks'
+        last_follower_count is updated, as that is the count each change is measured from.
+        """
+        if not self.enabled:
+            return
+        previous = {}
+        changes = []
+        for entry in written:
+            track = entry.track
+            last_count = previous.get(track.id, track.last_follower_count)
+            previous[track.id] = entry.follower_count
+            # A track without a previous count has nothing to compare against yet.
+            if not last_count or entry.follower_count == last_count:
+                continue
+            observed_at = entry.observed_at.replace(tzinfo=timezone.utc).timestamp()
+            platform = SocialMediaPlatform(track.social_media).value
+            changes.append((str(track.id), platform, entry.follower_count - last_count, observed_at))
+        if not changes:
+            return
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for hours in LEADERBOARD_WINDOWS:
+                    ttl = hours * 3600 * 2
+                    touched = set()
+                    for track_id, platform, change, observed_at in changes:
+                        slice_id = int(observed_at // self.slice_seconds(hours))
+                        for scope in (ALL_PLATFORMS, platform):
+                            key = self.key(hours, scope)
+                            pipe.zincrby(key, change, track_id)
+                            pipe.zincrby(f"{key}:{slice_id}", change, track_id)
+                            touched.add((key, slice_id))
+                    for key, slice_id in touched:
+                        pipe.expire(f"{key}:{slice_id}", ttl)
+                    for key in {key for key, _ in touched}:
+                        pipe.expire(key, ttl)
+                        pipe.set(f"{key}:started", time.time(), nx=True)
+                        pipe.expire(f"{key}:started", ttl)
+                await pipe.execute()
+            for hours in LEADERBOARD_WINDOWS:
+                for scope in {ALL_PLATFORMS, *(platform for _, platform, _, _ in changes)}:
+                    await self.expire(hours, scope)
+        except Exception as e:
+            logger.warning(f"Updating the follower leaderboard failed: {e}")
+
+    async def expire(self, hours: int, scope: str, now: float = None) -> None:
+        """
+        Subtract every slice that ended before the window start from the window total.
+        """
+        now = now or time.time()
+        key = self.key(hours, scope)
+        slice_seconds = self.slice_seconds(hours)
+        # Newest slice that lies completely before the window.
+        last_expired = int((now - hours * 3600) // slice_seconds) - 1
+        cursor = await self.redis.get(f"{key}:expired")
+        first = int(cursor) + 1 if cursor is not None else last_expired - settings.LEADERBOARD_SLICES
+        if first > last_expired:
+            return
+
+        ttl = hours * 3600 * 2
+        for slice_id in range(first, last_expired + 1):
+            slice_key = f"{key}:{slice_id}"
+            if not await self.redis.set(f"{slice_key}:claimed", 1, nx=True, ex=ttl):
+                continue
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zunionstore(key, {key: 1, slice_key: -1})
+                pipe.zremrangebyscore(key, 0, 0)
+                pipe.delete(slice_key)
+                await pipe.execute()
+        await self.redis.set(f"{key}:expired", last_expired, ex=ttl)
+
+    async def top(self, hours: int, top_n: int, social_media: str = None):
+        """
+        [{"track_id", "change"}] of the `top_n` largest absolute changes over a standard window,
+        or None when the leaderboard cannot answer yet (disabled, or younger than the window).
+        """
+        if not self.enabled or hours not in LEADERBOARD_WINDOWS:
+            return None
+        scope = SocialMediaPlatform(social_media).value if social_media else ALL_PLATFORMS
+        key = self.key(hours, scope)
+        try:
+            started = await self.redis.get(f"{key}:started")
+            if started is None or time.time() - float(started) < hours * 3600:
+                return None
+            await self.expire(hours, scope)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.zrevrange(key, 0, top_n - 1, withscores=True)
+                pipe.zrange(key, 0, top_n - 1, withscores=True)
+                gains, losses = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Reading the follower leaderboard failed: {e}")
+            return None
+
+        ranked = {track_id.decode(): int(change) for track_id, change in gains + losses}
+        top = sorted(ranked.items(), key=lambda item: abs(item[1]), reverse=True)[:top_n]
+        return [{"track_id": track_id, "change": change} for track_id, change in top if change]
+
+
+leaderboard = FollowerLeaderboard()
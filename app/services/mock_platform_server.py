@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import logging
+import math
+import random
+import time
+
+from aiohttp import web
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+class MockPlatformServer:
+    """
+    Local stand-in for the Instagram and Twitter endpoints used by FollowerChecker.
+
+    Follower counts follow a random walk per profile, and every response can be delayed,
+    failed or rate limited according to the configured profile, so the real aiohttp
+    fetch path can be load tested without touching the platforms.
+    """
+
+    def __init__(
+        self,
+        latency: str = "lognormal",
+        latency_ms: float = 50,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: int = 0,
+        walk_step: int = 5,
+        seed: int = None,
+    ):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency must be one of {LATENCY_DISTRIBUTIONS}")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        # Requests allowed per one second window before answering 429, 0 disables the window.
+        self.rate_limit = rate_limit
+        self.walk_step = walk_step
+        self.random = random.Random(seed)
+        self.followers = {}
+        self.window_started = int(time.time())
+        self.window_requests = 0
+        self.requests = 0
+
+    def delay(self) -> float:
+        mean = self.latency_ms / 1000
+        if self.latency == "fixed":
+            return mean
+        if self.latency == "uniform":
+            return self.random.uniform(0, 2 * mean)
+        if self.latency == "exponential":
+            return self.random.expovariate(1 / mean) if mean > 0 else 0.0
+        # Lognormal with the configured mean and a long tail.
+        sigma = 0.75
+        return self.random.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma) if mean > 0 else 0.0
+
+    def follower_count(self, platform: str, username: str) -> int:
+        key = (platform, username)
+        count = self.followers.get(key)
+        if count is None:
+            count = self.random.randint(100, 100_000)
+        count = max(0, count + self.random.randint(-self.walk_step, self.walk_step))
+        self.followers[key] = count
+        return count
+
+    def rate_limit_headers(self) -> dict:
+        now = int(time.time())
+        if now != self.window_started:
+            self.window_started = now
+            self.window_requests = 0
+        self.window_requests += 1
+        if not self.rate_limit:
+            return {}
+        return {
+            "x-rate-limit-limit": str(self.rate_limit),
+            "x-rate-limit-remaining": str(max(0, self.rate_limit - self.window_requests)),
+            "x-rate-limit-reset": str(self.window_started + 1),
+        }
+
+    async def respond(self, build_body) -> web.Response:
+        self.requests += 1
+        headers = self.rate_limit_headers()
+        await asyncio.sleep(self.delay())
+
+        over_limit = self.rate_limit and self.window_requests > self.rate_limit
+        if over_limit or self.random.random() < self.throttle_rate:
+            return web.json_response({"error": "rate limited"}, status=429, headers={**headers, "retry-after": "1"})
+        if self.random.random() < self.error_rate:
+            return web.json_response({"error": "upstream error"}, status=500, headers=headers)
+        return web.json_response(build_body(), headers=headers)
+
+    def profile(self, platform: str, username: str) -> dict:
+        return {"username": username, "followers_count": self.follower_count(platform, username)}
+
+    async def instagram_followers(self, request: web.Request) -> web.Response:
+        username = request.match_info["username"]
+        return await self.respond(lambda: self.profile("Instagram", username))
+
+    async def twitter_user(self, request: web.Request) -> web.Response:
+        username = request.match_info["username"]
+        return await self.respond(lambda: self.profile("Twitter", username))
+
+    async def twitter_users(self, request: web.Request) -> web.Response:
+        usernames = [name for name in request.query.get("usernames", "").split(",") if name]
+        if len(usernames) > 100:
+            return web.json_response({"error": "at most 100 usernames"}, status=400)
+        return await self.respond(lambda: {
+            "data": [
+                {"username": username, "public_metrics": {"followers_count": self.follower_count("Twitter", username)}}
+                for username in usernames
+            ]
+        })
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/v1/users/{username}/followers", self.instagram_followers)
+        app.router.add_get("/2/users/by/username/{username}", self.twitter_user)
+        app.router.add_get("/2/users/by", self.twitter_users)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 9000) -> web.AppRunner:
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"Mock platform API listening on http://{host}:{port}")
+        return runner
+
+
+async def serve(host: str, port: int, **options) -> None:
+    runner = await MockPlatformServer(**options).start(host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    """
+    Serve the stand-in API, then point the poller at it, e.g.:
+
+        python -m app.services.mock_platform_server --port 9000 --error-rate 0.01
+        USE_MOCK_DATA=false INSTAGRAM_API_URL=http://127.0.0.1:9000 TWITTER_API_URL=http://127.0.0.1:9000 ...
+    """
+    parser = argparse.ArgumentParser(description="Local Instagram/Twitter API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(
+        serve(
+            args.host,
+            args.port,
+            latency=args.latency,
+            latency_ms=args.latency_ms,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            rate_limit=args.rate_limit,
+            seed=args.seed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import heapq
+import itertools
+import time
+from app.constants.enums import SocialMediaPlatform
+from app.core.config import settings
+
+
+def profile_key(track) -> tuple:
+    """
+    (platform, profile_username) of a track: tracks of several users watching one profile share it.
+    """
+    return SocialMediaPlatform(track.social_media), track.profile_username
+
+
+class ProfileSchedule:
+    """
+    Polling state of one profile: when it is due next and how fast its follower count moves.
+    Holds no track rows, the poller loads the profile's tracks per chunk when it is dispatched.
+    """
+
+    __slots__ = ("key", "thresholds", "interval", "next_due", "last_count", "last_polled_at", "rate", "generation")
+
+    def __init__(self, key: tuple, interval: float, next_due: float, last_count: int = None):
+        self.key = key
+        # Alert thresholds of the profile's tracks.
+        self.thresholds = set()
+        # Track refresh that last saw this profile.
+        self.generation = 0
+        self.interval = interval
+        self.next_due = next_due
+        self.last_count = last_count
+        self.last_polled_at = None
+        # Smoothed absolute follower change per second.
+        self.rate = 0.0
+
+
+class PollScheduler:
+    """
+    Keeps a next-due time per profile in a heap and adapts each profile's polling interval.
+
+    Volatile profiles and profiles getting close to an alert threshold are polled more often,
+    dormant profiles back off, always within [min_interval, max_interval]. All tracks of a
+    profile are due together, so the poller fetches it once and fans the count out.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = None,
+        max_interval: float = None,
+        target_change: float = None,
+        smoothing: float = None,
+    ):
+        self.min_interval = min_interval or settings.POLL_MIN_INTERVAL
+        self.max_interval = max_interval or settings.POLL_MAX_INTERVAL
+        self.target_change = target_change or settings.POLL_TARGET_CHANGE
+        self.smoothing = smoothing or settings.POLL_VOLATILITY_SMOOTHING
+        self.schedules = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._generation = 0
+
+    def __len__(self):
+        return len(self.schedules)
+
+    def _push(self, schedule: ProfileSchedule):
+        heapq.heappush(self._heap, (schedule.next_due, next(self._sequence), schedule.key))
+
+    def sync(self, tracks, now: float = None):
+        """
+        Align the schedule with the current set of tracks: new profiles are due right away,
+        profiles without tracks are dropped and known ones pick up their tracks' latest thresholds.
+        """
+        self.start_sync()
+        self.sync_chunk(tracks, now)
+        self.finish_sync()
+
+    def start_sync(self):
+        """
+        Begin a track refresh that is fed chunk by chunk through sync_chunk.
+        """
+        self._generation += 1
+
+    def sync_chunk(self, tracks, now: float = None):
+        """
+        Add the new profiles of one chunk (due right away) and update the known ones.
+        """
+        now = time.monotonic() if now is None else now
+        for track in tracks:
+            key = profile_key(track)
+            schedule = self.schedules.get(key)
+            if schedule is None:
+                interval = min(max(settings.FOLLOWER_CHECKER_INTERVAL, self.min_interval), self.max_interval)
+                schedule = ProfileSchedule(key, interval, now, track.last_follower_count)
+                self.schedules[key] = schedule
+                self._push(schedule)
+            if schedule.generation != self._generation:
+                # First track of this profile in the current refresh.
+                schedule.thresholds = set()
+                schedule.generation = self._generation
+            if track.alert_threshold is not None:
+                schedule.thresholds.add(track.alert_threshold)
+
+    def finish_sync(self):
+        """
+        Drop the profiles no chunk of the current refresh contained.
+        """
+        for key in [key for key, schedule in self.schedules.items() if schedule.generation != self._generation]:
+            # Heap entries of dropped profiles are skipped lazily in pop_due.
+            del self.schedules[key]
+
+    def pop_due(self, now: float = None, limit: int = None) -> list:
+        """
+        (platform, profile_username) keys of up to `limit` profiles that are due, most overdue first.
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+            next_due, _, key = heapq.heappop(self._heap)
+            schedule = self.schedules.get(key)
+            if schedule is None or schedule.next_due != next_due:
+                continue
+            due.append(key)
+        return due
+
+    def seconds_until_next(self, now: float = None) -> float:
+        now = time.monotonic() if now is None else now
+        while self._heap:
+            next_due, _, key = self._heap[0]
+            schedule = self.schedules.get(key)
+            if schedule is None or schedule.next_due != next_due:
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, next_due - now)
+        return self.max_interval
+
+    def observe(self, key: tuple, follower_count, now: float = None):
+        """
+        Record a poll result and schedule the profile's next poll. A failed fetch
+        (follower_count None) keeps the current interval.
+        """
+        now = time.monotonic() if now is None else now
+        schedule = self.schedules.get(key)
+        if schedule is None:
+            return
+
+        if follower_count is not None:
+            if schedule.last_polled_at is not None and schedule.last_count is not None:
+                elapsed = max(now - schedule.last_polled_at, 1e-3)
+                observed_rate = abs(follower_count - schedule.last_count) / elapsed
+                schedule.rate += self.smoothing * (observed_rate - schedule.rate)
+            schedule.last_count = follower_count
+            schedule.last_polled_at = now
+            schedule.interval = self.next_interval(schedule)
+
+        schedule.next_due = now + schedule.interval
+        self._push(schedule)
+
+    def next_interval(self, schedule: ProfileSchedule) -> float:
+        if schedule.rate <= 0:
+            # Nothing moved: back off geometrically towards the maximum interval.
+            interval = schedule.interval * 2
+        else:
+            # Expect about `target_change` followers between two polls.
+            interval = self.target_change / schedule.rate
+            last_count = schedule.last_count
+            ahead = [threshold for threshold in schedule.thresholds if last_count is not None and last_count < threshold]
+            if ahead:
+                # Poll at least twice before the nearest threshold is expected to be crossed.
+                interval = min(interval, (min(ahead) - last_count) / schedule.rate / 2)
+        return min(max(interval, self.min_interval), self.max_interval)
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import random
+import time
+import logging
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _header_float(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                continue
+    return None
+
+
+class TokenBucket:
+    """
+    Token bucket for one platform credential, corrected by the rate-limit headers the platform returns.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.remaining = None
+        self.limit = None
+        self.reset_at = None
+        self.usage_percent = None
+        self.throttled = 0
+        self.waiting = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        self.waiting += 1
+        try:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+
+    def block_for(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+    def update(self, headers):
+        """
+        Align the bucket with what the platform reports: Twitter style x-rate-limit-* headers,
+        generic x-ratelimit-* headers and Instagram/Graph API x-app-usage percentages.
+        """
+        limit = _header_float(headers, "x-rate-limit-limit", "x-ratelimit-limit")
+        remaining = _header_float(headers, "x-rate-limit-remaining", "x-ratelimit-remaining")
+        reset = _header_float(headers, "x-rate-limit-reset", "x-ratelimit-reset")
+
+        if limit is not None:
+            self.limit = int(limit)
+        if reset is not None:
+            # Epoch seconds (Twitter) or seconds from now (draft RFC headers).
+            self.reset_at = reset if reset > 10 ** 9 else time.time() + reset
+        if remaining is not None:
+            self.remaining = int(remaining)
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and self.reset_at is not None:
+                self.block_for(max(0.0, self.reset_at - time.time()))
+
+        app_usage = headers.get("x-app-usage")
+        if app_usage:
+            try:
+                self.usage_percent = max(float(value) for value in json.loads(app_usage).values())
+            except (ValueError, TypeError, AttributeError):
+                return
+            if self.usage_percent >= 100:
+                self.block_for(settings.RATE_LIMIT_BACKOFF_MAX)
+
+    def to_dict(self) -> dict:
+        now = time.monotonic()
+        self._refill(now)
+        return dict(
+            rate=self.rate,
+            capacity=self.capacity,
+            tokens=round(self.tokens, 2),
+            remaining=self.remaining,
+            limit=self.limit,
+            reset_in=round(self.reset_at - time.time(), 1) if self.reset_at else None,
+            usage_percent=self.usage_percent,
+            blocked_for=round(max(0.0, self.blocked_until - now), 1),
+            waiting=self.waiting,
+            throttled=self.throttled,
+        )
+
+
+class RateLimiter:
+    """
+    Token buckets per (platform, credential) in front of every platform API call.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+
+    def bucket(self, platform: str, credential: str = None) -> TokenBucket:
+        key = (platform, credential or "default")
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            limits = settings.PLATFORM_RATE_LIMITS.get(platform, {})
+            bucket = TokenBucket(rate=limits.get("rate", 1.0), capacity=limits.get("burst", 1))
+            self.buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, platform: str, credential: str = None):
+        await self.bucket(platform, credential).acquire()
+
+    def update(self, platform: str, headers, credential: str = None):
+        self.bucket(platform, credential).update(headers)
+
+    def backoff(self, platform: str, attempt: int, headers, credential: str = None) -> float:
+        """
+        Block the bucket after a 429. Honours Retry-After or the reset header when present,
+        otherwise uses exponential backoff; both with random jitter.
+        """
+        bucket = self.bucket(platform, credential)
+        bucket.throttled += 1
+        retry_after = _header_float(headers, "retry-after")
+        if retry_after is None and bucket.reset_at is not None:
+            retry_after = max(0.0, bucket.reset_at - time.time())
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, settings.RATE_LIMIT_BACKOFF_BASE)
+        else:
+            delay = random.uniform(0, settings.RATE_LIMIT_BACKOFF_BASE * 2 ** attempt)
+        delay = min(delay, settings.RATE_LIMIT_BACKOFF_MAX)
+        bucket.block_for(delay)
+        return delay
+
+    def to_dict(self) -> dict:
+        return {
+            f"{platform}:{credential}": bucket.to_dict()
+            for (platform, credential), bucket in self.buckets.items()
+        }
+
+
+rate_limiter = RateLimiter()
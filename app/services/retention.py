@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import crud
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Keeps concurrent app instances from running the job at the same time.
+RETENTION_LOCK_ID = 720_431_119
+
+
+async def delete_in_batches(db, delete_batch, before: datetime) -> int:
+    """
+    Call `delete_batch(db=..., before=..., limit=...)` in its own short transaction until nothing
+    older than `before` is left, pausing between batches so the job never holds locks for long.
+    """
+    deleted = 0
+    while True:
+        async with db.begin():
+            count = await delete_batch(db=db, before=before, limit=settings.RETENTION_BATCH_SIZE)
+        deleted += count
+        if count < settings.RETENTION_BATCH_SIZE:
+            return deleted
+        await asyncio.sleep(settings.RETENTION_BATCH_PAUSE)
+
+
+async def expire_raw_history(db, cutoff: datetime) -> int:
+    """
+    Make sure every raw row before `cutoff` is represented in the hourly and daily rollups,
+    one day at a time, then delete the raw rows of that day.
+    """
+    oldest = await crud.follower_history.get_oldest_created_at(db)
+    await db.commit()
+    if oldest is None or oldest >= cutoff:
+        return 0
+    deleted = 0
+    day = oldest.replace(hour=0, minute=0, second=0, microsecond=0)
+    # Only whole hours are deleted, the rest of the hour waits for the next run.
+    cutoff = crud.follower_history_hourly.bucket_start(cutoff)
+    while day < cutoff:
+        next_day = day + timedelta(days=1)
+        # The whole day is rolled up, its raw rows after the cutoff are still complete.
+        async with db.begin():
+            for rollup in crud.ROLLUPS:
+                await rollup.backfill(db=db, since=day, until=next_day)
+        deleted += await delete_in_batches(db, crud.follower_history.delete_before, min(next_day, cutoff))
+        day = next_day
+    return deleted
+
+
+async def apply_retention(now: datetime = None) -> dict:
+    """
+    Downsample and delete follower history according to the retention settings:
+    raw rows become hourly buckets, hourly buckets are dropped in favour of daily ones,
+    and daily buckets are kept or dropped after their own retention. 0 days keeps a level forever.
+    """
+    now = now or datetime.utcnow()
+    deleted = dict(raw=0, hourly=0, daily=0)
+    async with engine.connect() as db:
+        locked = await db.scalar(select(func.pg_try_advisory_lock(RETENTION_LOCK_ID)))
+        await db.commit()
+        if not locked:
+            logger.info("Retention job is already running elsewhere")
+            return deleted
+        try:
+            if settings.FOLLOWER_HISTORY_RAW_RETENTION_DAYS:
+                cutoff = now - timedelta(days=settings.FOLLOWER_HISTORY_RAW_RETENTION_DAYS)
+                deleted["raw"] = await expire_raw_history(db, cutoff)
+            if settings.FOLLOWER_HISTORY_HOURLY_RETENTION_DAYS:
+                cutoff = now - timedelta(days=settings.FOLLOWER_HISTORY_HOURLY_RETENTION_DAYS)
+                deleted["hourly"] = await delete_in_batches(db, crud.follower_history_hourly.delete_before, cutoff)
+            if settings.FOLLOWER_HISTORY_DAILY_RETENTION_DAYS:
+                cutoff = now - timedelta(days=settings.FOLLOWER_HISTORY_DAILY_RETENTION_DAYS)
+                deleted["daily"] = await delete_in_batches(db, crud.follower_history_daily.delete_before, cutoff)
+        finally:
+            await db.execute(select(func.pg_advisory_unlock(RETENTION_LOCK_ID)))
+            await db.commit()
+    logger.info(f"🧹 Follower history retention deleted {deleted}")
+    return deleted
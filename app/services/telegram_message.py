@@ -1,6 +1,6 @@
-import aiohttp
 import logging
 from app.core.config import settings
+from app.core.http_client import http_client
 from app.db.session import SessionLocal as AsyncSessionLocal
 from app import crud
 
@@ -20,11 +20,10 @@ class TelegramNotifier:
 
     async def send_alert(self, username, threshold):
         message = f"🎉 {username} to  {threshold} has been reached"
-        data = {"chat_id": self.get_chat_id(username=username), "text": message}
+        data = {"chat_id": await self.get_chat_id(username=username), "text": message}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(self.API_URL, data=data) as response:
-                if response.status == 200:
-                    logging.info(f"✅ message for {username} sent")
-                else:
-                    logging.error(f"❌ error in sending message  {response.status}, {await response.text()}")
+        async with http_client.session.post(self.API_URL, data=data) as response:
+            if response.status == 200:
+                logging.info(f"✅ message for {username} sent")
+            else:
+                logging.error(f"❌ error in sending message  {response.status}, {await response.text()}")
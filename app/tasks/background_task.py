@@ -2,23 +2,111 @@
 from app.core.config import settings
 import asyncio
 import logging
+import os
+import socket
+import time
+import uuid
+from app.db import partitions
+from app.db.session import SessionLocal
 from app.services.check_follower import FollowerChecker
+from app.services.poll_scheduler import PollScheduler, profile_key
+from app.services.retention import apply_retention
 
 logging.basicConfig(level=logging.INFO)
 
 
 async def run_follower_check():
     """
-    Background task to check follower counts periodically.
+    Background task to check follower counts, dispatching each profile with all its tracks
+    when its adaptive polling interval says it is due.
     """
     checker = FollowerChecker()
+    scheduler = PollScheduler()
+    refresh_at = 0.0
 
+    while True:
+        if time.monotonic() >= refresh_at:
+            try:
+                await checker.load_schedule(scheduler)
+            except Exception as e:
+                logging.error(f"❌ Error loading tracks: {e}")
+            refresh_at = time.monotonic() + settings.POLL_TRACK_REFRESH_INTERVAL
+
+        due = scheduler.pop_due(limit=settings.POLL_DISPATCH_LIMIT)
+        if due:
+            logging.info(f"🔄 Running follower check task for {len(due)} due profiles...")
+            counts = {}
+            try:
+                counts = {profile_key(track): follower_count for track, follower_count in await checker.poll_due(due)}
+            except Exception as e:
+                logging.error(f"❌ Error in background task: {e}")
+            # Profiles that failed or have no tracks left keep their interval.
+            for key in due:
+                scheduler.observe(key, counts.get(key))
+            continue
+
+        await asyncio.sleep(min(scheduler.seconds_until_next(), max(0.0, refresh_at - time.monotonic())))
+
+
+async def run_leased_follower_check(worker_id: str = None):
+    """
+    Background task that polls only the tracks it holds a lease on, so any number of
+    workers can share the track table.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    checker = FollowerChecker()
+    logging.info(f"🔄 Leased follower check started as {worker_id}")
+
+    while True:
+        claimed = 0
+        try:
+            claimed = await checker.check_leased_followers(worker_id)
+        except Exception as e:
+            logging.error(f"❌ Error in leased background task: {e}")
+
+        # A full batch means more tracks are probably due, so claim again right away.
+        if claimed < settings.TRACK_LEASE_BATCH_SIZE:
+            await asyncio.sleep(settings.TRACK_LEASE_IDLE_SLEEP)
+
+
+async def run_partition_maintenance():
+    """
+    Background task that keeps future follower_history partitions created and expired ones detached.
+    """
+    while True:
+        try:
+            async with SessionLocal() as db:
+                await partitions.maintain_partitions(
+                    db,
+                    months_ahead=settings.FOLLOWER_HISTORY_PARTITIONS_AHEAD,
+                    retention_months=settings.FOLLOWER_HISTORY_RETENTION_MONTHS,
+                    drop=settings.FOLLOWER_HISTORY_DROP_EXPIRED_PARTITIONS,
+                )
+        except Exception as e:
+            logging.error(f"❌ Error in partition maintenance: {e}")
+
+        await asyncio.sleep(settings.PARTITION_MAINTENANCE_INTERVAL)
+
+
+async def run_retention():
+    """
+    Background task that downsamples and deletes follower history past its retention.
+    """
     while True:
         try:
-            logging.info("🔄 Running follower check task...")
-            await checker.check_followers()
+            await apply_retention()
         except Exception as e:
-            logging.error(f"❌ Error in background task: {e}")
+            logging.error(f"❌ Error in follower history retention: {e}")
 
-        await asyncio.sleep(settings.FOLLOWER_CHECKER_INTERVAL)
+        await asyncio.sleep(settings.RETENTION_INTERVAL)
 
+
+def follower_check_task():
+    """
+    The follower check coroutine for the configured FOLLOWER_CHECKER_MODE, or None when disabled.
+    """
+    if settings.FOLLOWER_CHECKER_MODE == "leased":
+        return run_leased_follower_check()
+    if settings.FOLLOWER_CHECKER_MODE == "disabled":
+        return None
+    return run_follower_check()
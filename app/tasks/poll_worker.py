@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+
+from app.core.http_client import http_client
+from app.tasks.background_task import run_leased_follower_check
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def run_worker() -> None:
+    http_client.start()
+    try:
+        await run_leased_follower_check()
+    finally:
+        await http_client.close()
+
+
+def start_worker() -> None:
+    asyncio.run(run_worker())
+
+
+def main() -> None:
+    """
+    Run standalone leased pollers, e.g. to check several workers against one database:
+
+        python -m app.tasks.poll_worker --processes 4
+    """
+    parser = argparse.ArgumentParser(description="Run leased follower check workers")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.processes == 1:
+        start_worker()
+        return
+
+    workers = [
+        multiprocessing.Process(target=start_worker, name=f"poll-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    logger.info(f"Started {len(workers)} poll workers")
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import crud
+from app.db.session import SessionLocal, engine
+from app.models import FollowerHistory
+from app.services.retention import RETENTION_LOCK_ID
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_rollups(since: datetime = None, until: datetime = None, chunk_days: int = 7) -> None:
+    """
+    Recompute the hourly and daily rollups from raw follower_history, one transaction per chunk of days.
+    Without `since` the rebuild starts at the oldest history row. Buckets older than what raw history
+    fully covers are only backfilled where missing, never deleted (see CRUDFollowerRollup.rebuild).
+    Holds the retention job's advisory lock throughout, so retention never deletes raw rows mid-rebuild.
+    """
+    async with engine.connect() as lock:
+        logger.info("Waiting for the retention lock")
+        await lock.execute(select(func.pg_advisory_lock(RETENTION_LOCK_ID)))
+        await lock.commit()
+        try:
+            await rebuild_chunks(since, until, chunk_days)
+        finally:
+            await lock.execute(select(func.pg_advisory_unlock(RETENTION_LOCK_ID)))
+            await lock.commit()
+
+
+async def rebuild_chunks(since: datetime, until: datetime, chunk_days: int) -> None:
+    async with SessionLocal() as db:
+        if since is None:
+            since = (await db.execute(select(func.min(FollowerHistory.created_at)))).scalar()
+            if since is None:
+                logger.info("No follower history to roll up")
+                return
+        until = until or datetime.utcnow() + timedelta(days=1)
+        start = since.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = until.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        while start < end:
+            chunk_end = min(start + timedelta(days=chunk_days), end)
+            async with db.begin():
+                written = [
+                    await rollup.rebuild(db=db, since=start, until=chunk_end) for rollup in crud.ROLLUPS
+                ]
+            logger.info(f"Rebuilt rollups {start:%Y-%m-%d} to {chunk_end:%Y-%m-%d}: {written[1]} hourly, {written[0]} daily buckets")
+            start = chunk_end
+
+
+def main() -> None:
+    """
+    Backfill or repair the follower rollups from raw history, e.g.:
+
+        python -m app.tasks.rebuild_rollups --since 2024-01-01
+    """
+    parser = argparse.ArgumentParser(description="Rebuild hourly/daily follower rollups from follower_history")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="default: oldest history row")
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None, help="default: tomorrow")
+    parser.add_argument("--chunk-days", type=int, default=7)
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            await rebuild_rollups(args.since, args.until, args.chunk_days)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
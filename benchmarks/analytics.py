@@ -0,0 +1,129 @@
+"""
+Compare the NumPy analytics in app.services.analytics with equivalent pure-Python loops.
+
+Samples are synthetic random walks, so no database is needed:
+
+    python -m benchmarks.analytics --samples 1000000 2000000 --tracks 1000
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app.services import analytics
+
+
+def python_growth(rows) -> dict:
+    """
+    Per-track first/last percent change and least-squares slope, looping over row tuples
+    the way the old stats code did.
+    """
+    tracks = {}
+    for track_id, timestamp, count in rows:
+        data = tracks.get(track_id)
+        if data is None:
+            data = tracks[track_id] = dict(first=count, last=count, start=timestamp, n=0, x=0.0, y=0.0, xx=0.0, xy=0.0)
+        x = (timestamp - data["start"]) / analytics.DAY
+        data["last"] = count
+        data["n"] += 1
+        data["x"] += x
+        data["y"] += count
+        data["xx"] += x * x
+        data["xy"] += x * count
+    growth = {}
+    for track_id, data in tracks.items():
+        rate = (data["last"] - data["first"]) / data["first"] * 100 if data["first"] > 0 else 0.0
+        denominator = data["n"] * data["xx"] - data["x"] ** 2
+        slope = (data["n"] * data["xy"] - data["x"] * data["y"]) / denominator if denominator > 0 else 0.0
+        growth[track_id] = (rate, slope)
+    return growth
+
+
+def python_moving_average(values, window: int) -> list:
+    averages = [math.nan] * len(values)
+    total = 0.0
+    for i, value in enumerate(values):
+        total += value
+        if i >= window:
+            total -= values[i - window]
+        if i >= window - 1:
+            averages[i] = total / window
+    return averages
+
+
+def python_zscores(values, window: int) -> list:
+    changes = [values[i + 1] - values[i] for i in range(len(values) - 1)]
+    scores = [0.0] * len(changes)
+    total = squares = 0.0
+    for i, change in enumerate(changes):
+        if i >= window:
+            mean = total / window
+            deviation = math.sqrt(max(squares / window - mean ** 2, 0.0))
+            scores[i] = (change - mean) / deviation if deviation > 0 else 0.0
+            total -= changes[i - window]
+            squares -= changes[i - window] ** 2
+        total += change
+        squares += change ** 2
+    return scores
+
+
+def make_samples(samples: int, tracks: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    track_ids = np.sort(rng.integers(0, tracks, samples))
+    timestamps = np.empty(samples)
+    counts = np.empty(samples)
+    starts = np.flatnonzero(np.r_[True, track_ids[1:] != track_ids[:-1]])
+    ends = np.append(starts[1:], samples)
+    for start, end in zip(starts, ends):
+        timestamps[start:end] = 1.7e9 + np.sort(rng.uniform(0, 7 * analytics.DAY, end - start))
+        counts[start:end] = rng.integers(1000, 100000) + np.cumsum(rng.integers(-20, 21, end - start))
+    return track_ids, timestamps, counts
+
+
+def timed(label: str, function, runs: int):
+    best = math.inf
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<28} {best:>8.3f}s")
+    return result, best
+
+
+def main(args) -> None:
+    for samples in args.samples:
+        track_ids, timestamps, counts = make_samples(samples, args.tracks)
+        rows = list(zip(track_ids.tolist(), timestamps.tolist(), counts.tolist()))
+        values = counts.tolist()
+        print(f"{samples:,} samples, {args.tracks:,} tracks")
+
+        expected, python_time = timed("python growth", lambda: python_growth(rows), args.runs)
+
+        def numpy_growth():
+            series = analytics.build_series(track_ids, timestamps, counts)
+            return series, analytics.growth_rates(series), analytics.growth_per_day(series)
+
+        (series, rates, slopes), numpy_time = timed("numpy growth", numpy_growth, args.runs)
+        assert np.allclose(rates, [expected[t][0] for t in series.track_ids])
+        assert np.allclose(slopes, [expected[t][1] for t in series.track_ids], rtol=1e-6, atol=1e-6)
+        print(f"  {'speedup':<28} {python_time / numpy_time:>8.1f}x")
+
+        expected, python_time = timed("python moving average", lambda: python_moving_average(values, args.window), args.runs)
+        result, numpy_time = timed("numpy moving average", lambda: analytics.moving_average(counts, args.window), args.runs)
+        assert np.allclose(result, expected, equal_nan=True)
+        print(f"  {'speedup':<28} {python_time / numpy_time:>8.1f}x")
+
+        expected, python_time = timed("python z-scores", lambda: python_zscores(values, args.window), args.runs)
+        result, numpy_time = timed("numpy z-scores", lambda: analytics.rolling_zscores(counts, args.window), args.runs)
+        assert np.allclose(result, expected, atol=1e-6)
+        print(f"  {'speedup':<28} {python_time / numpy_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, nargs="+", default=[1000000, 2000000])
+    parser.add_argument("--tracks", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=24)
+    parser.add_argument("--runs", type=int, default=3)
+    main(parser.parse_args())
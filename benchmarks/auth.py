@@ -0,0 +1,158 @@
+"""
+Compare the old blocking token verification with the async pooled one under concurrent load.
+
+Runs a small stand-in Redis server (GET/SET over RESP, configurable latency) in its own thread
+and reports request latency percentiles for both paths:
+
+    python -m benchmarks.auth --requests 5000 --concurrency 100 --redis-latency-ms 1
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+import uuid
+
+import redis
+from jose import jwt
+
+from app.api import deps
+from app.core import security
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+
+class StandInRedis:
+    """
+    Answers GET, SET, PING and the redis-py handshake from a dict after `latency` seconds, on its
+    own event loop so a client blocking the benchmark's loop cannot stall the server as well.
+    """
+
+    def __init__(self, port: int, latency: float):
+        self.port = port
+        self.latency = latency
+        self.store = {}
+        self.ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        resp3 = False
+        try:
+            while line := await reader.readline():
+                args = []
+                for _ in range(int(line[1:])):
+                    size = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(size + 2))[:-2])
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if args[0].upper() == b"HELLO":
+                    resp3 = args[1] == b"3"
+                writer.write(self.reply(args, resp3))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def reply(self, args: list, resp3: bool) -> bytes:
+        command = args[0].upper()
+        if command == b"GET":
+            value = self.store.get(args[1])
+            if value is None:
+                return b"_\r\n" if resp3 else b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET":
+            self.store[args[1]] = args[2]
+            return b"+OK\r\n"
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command == b"HELLO":
+            return b"%%1\r\n$5\r\nproto\r\n:%s\r\n" % args[1]
+        if command in (b"CLIENT", b"SELECT"):
+            # Connection setup sent by redis-py.
+            return b"+OK\r\n"
+        return b"-ERR unknown command\r\n"
+
+    def serve(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(asyncio.start_server(self.handle, "127.0.0.1", self.port))
+        self.ready.set()
+        self.loop.run_forever()
+        server.close()
+
+    def start(self) -> None:
+        threading.Thread(target=self.serve, daemon=True).start()
+        self.ready.wait()
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def blocking_verify_token(token: str, port: int) -> dict:
+    """
+    The verification deps.verify_token did before: a new synchronous Redis connection per call.
+    """
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
+    redis_conn = redis.StrictRedis(host="127.0.0.1", port=port)
+    try:
+        user_data = redis_conn.get(payload["session"])
+        return dict(verified=user_data is not None, user_data=json.loads(user_data) if user_data else None)
+    finally:
+        redis_conn.close()
+
+
+async def run(label: str, verify, requests: int, concurrency: int, handler_ms: float) -> None:
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with limit:
+            started = time.perf_counter()
+            assert (await verify())["verified"]
+            # The rest of the request: awaited I/O that other requests can overlap with.
+            await asyncio.sleep(handler_ms / 1000)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{label:<24} {requests / elapsed:>8,.0f} req/s"
+        f"   p50 {p50:>7.2f}ms   p99 {p99:>7.2f}ms   max {latencies[-1] * 1000:>7.2f}ms"
+    )
+
+
+async def main(args) -> None:
+    server = StandInRedis(args.port, args.redis_latency_ms / 1000)
+    server.start()
+    settings.REDIS_SERVER = f"127.0.0.1:{args.port}/0"
+    session = uuid.uuid4().hex
+    server.store[session.encode()] = json.dumps({"id": str(uuid.uuid4())}).encode()
+    token = security.create_token(user_session=session, user_id="benchmark", email="benchmark@example.com")
+
+    async def blocking():
+        return blocking_verify_token(token, args.port)
+
+    async def pooled():
+        return await deps.verify_token(None, token)
+
+    try:
+        await run("blocking, per request", blocking, args.requests, args.concurrency, args.handler_ms)
+        await run("async, shared pool", pooled, args.requests, args.concurrency, args.handler_ms)
+    finally:
+        await redis_client.close()
+        server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--redis-latency-ms", type=float, default=1.0)
+    parser.add_argument("--handler-ms", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8766)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+"""
+Compare a fresh aiohttp session per request with the shared pooled HTTP client.
+
+Runs a local stand-in HTTP server and reports requests/sec for both modes:
+
+    python -m benchmarks.http_client --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from app.core.http_client import HTTPClient
+
+
+async def followers(request: web.Request) -> web.Response:
+    return web.json_response({"followers_count": 1000})
+
+
+async def start_server(port: int) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get("/followers", followers)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def run(label: str, fetch, requests: int, concurrency: int) -> None:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with limit:
+            await fetch()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {requests} requests in {elapsed:.2f}s -> {requests / elapsed:,.0f} req/s")
+
+
+async def main(requests: int, concurrency: int, port: int) -> None:
+    runner = await start_server(port)
+    url = f"http://127.0.0.1:{port}/followers"
+
+    async def session_per_request():
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                await response.json()
+
+    client = HTTPClient()
+
+    async def pooled():
+        async with client.session.get(url) as response:
+            await response.json()
+
+    try:
+        await run("session per request", session_per_request, requests, concurrency)
+        await run("shared pooled client", pooled, requests, concurrency)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.port))
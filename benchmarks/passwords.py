@@ -0,0 +1,77 @@
+"""
+Compare bcrypt checks on the event loop with the bounded password hashing pool.
+
+Runs concurrent logins (password verification only) while a ticker measures how late the event
+loop wakes it up, which is what every other request waiting on the loop experiences:
+
+    python -m benchmarks.passwords --logins 200 --concurrency 50 --workers 4
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core import security
+from app.core.config import settings
+from app.core.password_hasher import password_hasher
+
+PASSWORD = "benchmark-password"
+
+
+async def measure_lag(stop: asyncio.Event, interval: float, lags: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run(label: str, verify, logins: int, concurrency: int, interval: float) -> None:
+    limit = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    lags = []
+
+    async def one():
+        async with limit:
+            assert await verify()
+
+    ticker = asyncio.create_task(measure_lag(stop, interval, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    lags.sort()
+    p50 = statistics.median(lags) * 1000
+    p99 = lags[max(int(len(lags) * 0.99) - 1, 0)] * 1000
+    print(
+        f"{label:<20} {logins / elapsed:>7.1f} logins/s"
+        f"   loop lag p50 {p50:>8.2f}ms   p99 {p99:>8.2f}ms   max {lags[-1] * 1000:>8.2f}ms"
+    )
+
+
+async def main(args) -> None:
+    settings.PASSWORD_HASH_WORKERS = args.workers
+    settings.PASSWORD_HASH_QUEUE_SIZE = args.logins
+    hashed = security.get_password_hash(PASSWORD)
+
+    async def inline():
+        return security.verify_password(PASSWORD, hashed)
+
+    async def pooled():
+        return await password_hasher.verify(PASSWORD, hashed)
+
+    interval = args.tick_ms / 1000
+    try:
+        await run("on the event loop", inline, args.logins, args.concurrency, interval)
+        await run("hashing pool", pooled, args.logins, args.concurrency, interval)
+    finally:
+        await password_hasher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tick-ms", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""
+Run FollowerChecker.poll_tracks against the local platform stand-in server.
+
+Tracks are synthetic and history writes are discarded, so no database is needed;
+the numbers cover the fetch path (concurrency limits, rate limiter, HTTP pool):
+
+    python -m benchmarks.poller --tracks 1000 10000 100000 --latency-ms 50
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.core.http_client import http_client
+from app.services.check_follower import FollowerChecker, poller_stats
+from app.services.history_writer import FollowerHistoryWriter
+from app.services.mock_platform_server import LATENCY_DISTRIBUTIONS, MockPlatformServer
+
+
+class DiscardingHistoryWriter(FollowerHistoryWriter):
+    async def flush(self) -> list:
+        pending, self.buffer = self.buffer, []
+        return pending
+
+
+class BenchmarkChecker(FollowerChecker):
+    history_writer_class = DiscardingHistoryWriter
+
+
+def make_tracks(count: int, profiles: int) -> list:
+    platforms = ["Instagram", "Twitter"]
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            social_media=platforms[i % len(platforms)],
+            profile_username=f"user{i % profiles}",
+            last_follower_count=0,
+            alert_threshold=10 ** 12,
+            alert_enabled=True,
+        )
+        for i in range(count)
+    ]
+
+
+async def main(args) -> None:
+    logging.disable(logging.WARNING)
+    base_url = f"http://127.0.0.1:{args.port}"
+    settings.USE_MOCK_DATA = False
+    settings.LEADERBOARD_ENABLED = False
+    settings.INSTAGRAM_API_URL = base_url
+    settings.TWITTER_API_URL = base_url
+    settings.FOLLOWER_CHECKER_CONCURRENCY = args.concurrency
+    settings.FOLLOWER_CHECKER_PLATFORM_CONCURRENCY = {"Instagram": args.concurrency, "Twitter": args.concurrency}
+    settings.HTTP_POOL_LIMIT = args.concurrency
+    settings.HTTP_POOL_LIMIT_PER_HOST = args.concurrency
+    settings.PLATFORM_RATE_LIMITS = {
+        platform: {"rate": args.rate_limit, "burst": max(1, int(args.rate_limit))}
+        for platform in ("Instagram", "Twitter")
+    }
+
+    server = MockPlatformServer(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=1,
+    )
+    runner = await server.start(port=args.port)
+    http_client.start()
+    try:
+        print(f"{'tracks':>8} {'profiles':>9} {'requests':>9} {'cycle s':>9} {'tracks/s':>10} {'requests/s':>11} {'failed':>7}")
+        for count in args.tracks:
+            checker = BenchmarkChecker()
+            tracks = make_tracks(count, args.profiles or count)
+            requests_before = server.requests
+            started = time.perf_counter()
+            await checker.poll_tracks(tracks)
+            elapsed = time.perf_counter() - started
+            requests = server.requests - requests_before
+            print(
+                f"{count:>8} {poller_stats.last_cycle_profiles:>9} {requests:>9} {elapsed:>9.2f} {count / elapsed:>10,.0f}"
+                f" {requests / elapsed:>11,.0f} {poller_stats.last_cycle_failed:>7}"
+            )
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tracks", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--profiles", type=int, default=0, help="distinct profiles, 0 means one per track")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rate-limit", type=float, default=10 ** 6, help="requests per second per platform")
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=9000)
+    asyncio.run(main(parser.parse_args()))
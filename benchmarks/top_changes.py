@@ -0,0 +1,113 @@
+"""
+Compare the old in-Python top-follower-changes computation with the SQL window-function query.
+
+Needs a PostgreSQL database reachable through SQLALCHEMY_DATABASE_URI with the migrations applied.
+Seed data is generated server side inside a transaction that is rolled back at the end:
+
+    python -m benchmarks.top_changes --tracks 10000 --rows 2000000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.db.session import engine
+from app.models import FollowerHistory
+
+
+async def python_top_changes(db: AsyncSession, since: datetime, top_n: int) -> list:
+    """
+    The previous implementation: every row of the window is loaded and aggregated in Python.
+    """
+    result = await db.execute(
+        select(FollowerHistory.track_id, FollowerHistory.follower_count)
+        .where(FollowerHistory.created_at >= since)
+        .order_by(FollowerHistory.created_at.desc())
+    )
+    changes = {}
+    for track_id, count in result.fetchall():
+        if track_id in changes:
+            changes[track_id]["end"] = count
+        else:
+            changes[track_id] = {"start": count, "end": count}
+    ranked = sorted(
+        ((track_id, data["end"] - data["start"]) for track_id, data in changes.items()),
+        key=lambda change: abs(change[1]),
+        reverse=True,
+    )
+    return ranked[:top_n]
+
+
+async def seed(db: AsyncSession, tracks: int, rows: int, hours: int) -> None:
+    await db.execute(
+        text(
+            """
+            INSERT INTO tracks (id, social_media, profile_username, alert_threshold, alert_enabled, last_follower_count)
+            SELECT gen_random_uuid(), 'TWITTER', 'bench_' || i, 1000000, false, 0
+            FROM generate_series(1, :tracks) AS i
+            """
+        ),
+        {"tracks": tracks},
+    )
+    await db.execute(
+        text(
+            """
+            WITH bench_tracks AS (
+                SELECT id, row_number() OVER () AS n FROM tracks WHERE profile_username LIKE 'bench\\_%'
+            )
+            INSERT INTO follower_history (id, track_id, follower_count, created_at)
+            SELECT gen_random_uuid(), t.id, 10000 + (random() * 5000)::int,
+                   now() AT TIME ZONE 'UTC' - random() * make_interval(hours => :hours)
+            FROM generate_series(1, :rows) AS i
+            JOIN bench_tracks t ON t.n = 1 + i % :tracks
+            """
+        ),
+        {"rows": rows, "tracks": tracks, "hours": hours},
+    )
+    await db.execute(text("ANALYZE follower_history"))
+
+
+async def timed(label: str, runs: int, query) -> None:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await query()
+        timings.append(time.perf_counter() - started)
+    print(f"{label:<16} best {min(timings):.3f}s  mean {sum(timings) / len(timings):.3f}s")
+
+
+async def main(args) -> None:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        db = AsyncSession(bind=connection)
+        try:
+            started = time.perf_counter()
+            await seed(db, args.tracks, args.rows, args.hours)
+            print(f"seeded {args.rows:,} rows over {args.tracks:,} tracks in {time.perf_counter() - started:.1f}s")
+
+            since = datetime.utcnow() - timedelta(hours=args.window)
+            await timed("python loop", args.runs, lambda: python_top_changes(db, since, args.top_n))
+            await timed(
+                "sql window",
+                args.runs,
+                lambda: crud.follower_history.get_top_changes(db=db, since=since, top_n=args.top_n),
+            )
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=10000)
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--hours", type=int, default=24 * 7, help="age span of the seeded rows")
+    parser.add_argument("--window", type=int, default=24, help="hours argument of the query")
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))